@@ -0,0 +1,668 @@
+"""
+Timing and accuracy benchmarks for the free vortex wake in Atlas.vortex.
+
+Usage:
+    python vortex_benchmarks.py [name ...]
+
+With no arguments every benchmark is run. Each benchmark prints a small
+table to stdout.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from Atlas.vortex import vortexRing, inducedVelocity, ringVelocity, \
+                         treeRingVelocity, threadedVelocity, WakeHistory, \
+                         wakeField
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+from Atlas.test.testvals import values
+
+
+def relative_err(x, y):
+    return (np.abs(x-y)/np.linalg.norm(x)).max()
+
+
+def best_time(fn, repeat=3):
+    """ best wall-clock time of fn() over repeat calls """
+    best = np.inf
+    for i in range(repeat):
+        t0 = time.time()
+        fn()
+        best = min(best, time.time() - t0)
+    return best
+
+
+def design_case(Ns=15, Nw=15, Ntt=5, Ntheta=40):
+    """
+    vortexRing set up for a rotor of radius 10 m with Ns elements and a
+    smooth thrust distribution (defaults are the Ns=15 fidelity preset)
+    """
+    comp = vortexRing()
+    comp.yN = np.linspace(0, 10, Ns + 1)
+    yE = 0.5 * (comp.yN[1:] + comp.yN[:-1])
+    comp.dT = (0.3 * yE**2 * (1 - (yE / 10)**4) + 0.05) * (10. / Ns)
+    comp.qh = np.zeros(Ns + 1)
+    comp.Nw = Nw
+    comp.Ntt = Ntt
+    comp.Ntheta = Ntheta
+    return comp
+
+
+def synthetic_wake(Ns, Nw):
+    """
+    (r, z, Gamma) of a contracting-then-expanding, descending hover wake with
+    Nw disks of Ns+1 rings, for kernel benchmarks at sizes where running
+    vortexRing itself would be too slow
+    """
+    yN = np.linspace(0, 10, Ns + 1)
+    i = np.arange(Nw)[:, np.newaxis]
+    r = yN * (1 + 0.4 * (1 - np.exp(-i / 4.))) + 0.3 * np.sin(i + yN / 3.)
+    z = -0.8 * i * (0.3 + yN / 10.) + 0.2 * np.cos(2 * i + yN)
+
+    yE = 0.5 * (yN[1:] + yN[:-1])
+    GammaBound = (0.3 * yE**2 * (1 - (yE / 10)**4) + 0.05) / (1.18 * yE * Ns)
+    Gamma = np.zeros(Ns + 1)
+    Gamma[0] = -GammaBound[0]
+    Gamma[1:-1] = GammaBound[:-1] - GammaBound[1:]
+    Gamma[-1] = GammaBound[-1]
+    return r, z, np.tile(Gamma, (Nw, 1))
+
+
+def theta_array(Ntheta):
+    dtheta = np.pi / Ntheta
+    return np.linspace(dtheta / 2, np.pi - dtheta / 2, Ntheta), dtheta
+
+
+def wake_kernel_args(Ns, Nw, Ntheta):
+    """ ringVelocity arguments for all rings of a synthetic wake on itself """
+    r, z, Gamma = synthetic_wake(Ns, Nw)
+    thetaArray, dtheta = theta_array(Ntheta)
+    return (r, z, r[:, 1:], z[:, 1:], Gamma[:, 1:], thetaArray, dtheta,
+            0.5 * 10. / Ns, 1.5)
+
+
+def stored_induced_velocity(**kwargs):
+    """ inducedVelocity on the stored testvals wake """
+    comp = inducedVelocity()
+    comp.qh = values.qh
+    comp.Gamma = values.Gamma
+    comp.z = values.z
+    comp.r = values.r
+    comp.thetaArray = values.thetaArray
+    comp.yE = values.yE
+    comp.cr = values.cr
+    comp.Ns = values.Ns
+    comp.Nw = values.Nw
+    comp.dtheta = values.dtheta
+    for name, value in kwargs.items():
+        setattr(comp, name, value)
+    return comp
+
+
+def bench_induction():
+    """ quadrature vs closed-form elliptic ring induction """
+    print 'Ring induction: kernel time and blade vi error on the testvals wake'
+    print 'error is relative to a converged (Ntheta=4000) quadrature'
+
+    reference = stored_induced_velocity()
+    Ntheta = 4000
+    reference.dtheta = np.pi / Ntheta
+    reference.thetaArray = np.linspace(reference.dtheta / 2,
+                                       np.pi - reference.dtheta / 2, Ntheta)
+    reference.run()
+
+    print '%10s %8s %12s %12s' % ('induction', 'Ntheta', 'time [ms]', 'vi error')
+    for Ntheta in (20, 40):
+        dtheta = np.pi / Ntheta
+        thetaArray = np.linspace(dtheta / 2, np.pi - dtheta / 2, Ntheta)
+        for induction in ('quadrature', 'elliptic'):
+            comp = stored_induced_velocity(thetaArray=thetaArray, dtheta=dtheta,
+                                           induction=induction)
+            comp.run()
+
+            # kernel time for a full ring-on-ring evaluation of the wake
+            args = (values.r, values.z, values.r[:, 1:], values.z[:, 1:],
+                    values.Gamma[:, 1:], thetaArray, dtheta, values.cr, values.h)
+            t = best_time(lambda: ringVelocity(*args, induction=induction), 5)
+            print '%10s %8d %12.3f %12.2e' % (induction, Ntheta, t * 1e3,
+                                              relative_err(reference.vi, comp.vi))
+
+    print
+    print 'vortexRing run, Ns=15 Nw=15 Ntt=5 Ntheta=40'
+    for induction in ('quadrature', 'elliptic'):
+        comp = design_case()
+        comp.induction = induction
+        print '%10s %10.3f s' % (induction, best_time(comp.run, 1))
+
+
+def bench_tree():
+    """ scaling of direct summation vs the Barnes-Hut tree code """
+    print 'Ring-ring velocity for all rings of a synthetic wake, Ntheta=40'
+    print 'tree error is max abs error relative to max |v| of direct summation'
+    print '%4s %4s %7s %12s %12s %12s' % ('Ns', 'Nw', 'rings', 'direct [s]',
+                                          'tree [s]', 'tree error')
+    sizes = []
+    times = {'direct': [], 'tree': []}
+    for Ns, Nw in ((15, 15), (30, 30), (60, 30), (60, 60)):
+        args = wake_kernel_args(Ns, Nw, 40)
+        rings = Ns * Nw
+        tree = treeRingVelocity(*args, openingAngle=0.5, threshold=0)
+        tTree = best_time(lambda: treeRingVelocity(*args, openingAngle=0.5,
+                                                   threshold=0), 1)
+        if rings <= 1800:
+            direct = ringVelocity(*args)
+            tDirect = best_time(lambda: ringVelocity(*args), 1)
+            error = max(np.abs(d - t).max() / np.abs(d).max()
+                        for d, t in zip(direct, tree))
+            times['direct'].append(tDirect)
+            print '%4d %4d %7d %12.3f %12.3f %12.2e' % (Ns, Nw, rings, tDirect,
+                                                        tTree, error)
+        else:
+            print '%4d %4d %7d %12s %12.3f %12s' % (Ns, Nw, rings, '-', tTree, '-')
+        sizes.append(rings)
+        times['tree'].append(tTree)
+
+    for name, t in sorted(times.items()):
+        slope = np.polyfit(np.log(sizes[:len(t)]), np.log(t), 1)[0]
+        print 'growth exponent (time ~ rings^p), %s: p = %.2f' % (name, slope)
+
+
+def bench_freeze():
+    """ far-wake freezing with vortex-cylinder closure """
+    print 'Design case Ns=15, elliptic induction: run time and blade vi error'
+    print 'error is relative to a free wake of Nw=16 disks'
+
+    def run(h, Nw, Kfreeze):
+        comp = design_case(Nw=Nw)
+        comp.h = h
+        comp.induction = 'elliptic'
+        comp.Kfreeze = Kfreeze
+        t = best_time(comp.run, 1)
+        iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'dtheta', 'h', 'induction', 'Kfreeze', 'rCyl', 'zCyl',
+                     'dzCyl', 'GammaCyl'):
+            setattr(iv, name, getattr(comp, name))
+        iv.Nw = Nw
+        iv.run()
+        return t, iv.vi
+
+    print '%8s %4s %8s %10s %10s' % ('h', 'Nw', 'Kfreeze', 'time [s]', 'vi error')
+    for h in (100., 1.5):
+        reference = run(h, 16, 0)[1]
+        for Nw, Kfreeze in ((4, 0), (8, 0), (16, 0), (16, 4), (16, 8)):
+            t, vi = run(h, Nw, Kfreeze)
+            print '%8.1f %4d %8d %10.3f %10.2e' % (h, Nw, Kfreeze, t,
+                                                   relative_err(reference, vi))
+
+
+def bench_integrators():
+    """ wake time integrators: accuracy vs velocity evaluations """
+    print 'Design case Ns=15 Nw=3, elliptic induction'
+    print 'errors against rk4 with Ntt=40: max ring position error [m] and blade vi'
+
+    def run(integrator, Ntt, stepTol=0.):
+        comp = design_case(Nw=3, Ntt=Ntt)
+        comp.induction = 'elliptic'
+        comp.integrator = integrator
+        comp.stepTol = stepTol
+        t = best_time(comp.run, 1)
+        iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'dtheta', 'h', 'induction'):
+            setattr(iv, name, getattr(comp, name))
+        iv.Nw = comp.Nw
+        iv.run()
+        return comp, t, iv.vi
+
+    reference, t, viReference = run('rk4', 40)
+    print '%10s %4s %8s %6s %10s %10s %10s' % ('integrator', 'Ntt', 'stepTol',
+                                               'Nvel', 'time [s]', 'position',
+                                               'vi error')
+    for integrator, Ntt, stepTol in (('euler', 5, 0.), ('euler', 20, 0.),
+                                     ('rk2', 1, 0.), ('rk2', 5, 0.),
+                                     ('rk4', 2, 0.), ('ab2', 2, 0.),
+                                     ('ab2', 10, 0.), ('rk2', 1, 0.01),
+                                     ('rk4', 1, 0.01), ('ab2', 1, 0.01)):
+        comp, t, vi = run(integrator, Ntt, stepTol)
+        error = max(np.abs(comp.z - reference.z).max(),
+                    np.abs(comp.r - reference.r).max())
+        print '%10s %4d %8.3f %6d %10.3f %10.2e %10.2e' % (
+            integrator, Ntt, stepTol, comp.Nvel, t, error,
+            relative_err(viReference, vi))
+
+
+def bench_warm():
+    """ warm start from a previous wake after a change of thrust """
+    print 'Design case Ns=15 Nw=15, elliptic induction, started from the wake'
+    print 'of the unscaled thrust; vi error relative to a cold start'
+
+    def run(scale, initial=None, viTol=0.):
+        comp = design_case()
+        comp.induction = 'elliptic'
+        comp.dT = comp.dT * scale
+        if initial is not None:
+            comp.GammaInit, comp.zInit, comp.rInit = initial
+            comp.viTol = viTol
+        t = best_time(comp.run, 1)
+        iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'Nw', 'dtheta', 'h', 'induction'):
+            setattr(iv, name, getattr(comp, name))
+        iv.run()
+        return comp, t, iv.vi
+
+    comp, t, vi = run(1.)
+    initial = (comp.Gamma.copy(), comp.z.copy(), comp.r.copy())
+    print '%6s %6s %5s %10s %10s' % ('thrust', 'viTol', 'Nrev', 'time [s]', 'vi error')
+    for scale in (1., 1.02, 1.1):
+        cold, t, viCold = run(scale)
+        print '%6.2f %6s %5d %10.3f %10s' % (scale, 'cold', cold.Nrev, t, '-')
+        for viTol in (0.05, 0.02):
+            warm, t, vi = run(scale, initial, viTol)
+            print '%6.2f %6.2f %5d %10.3f %10.2e' % (scale, viTol, warm.Nrev, t,
+                                                     relative_err(viCold, vi))
+
+
+def bench_periodic():
+    """ periodic wake solver against time marching """
+    print 'Periodic solver (Anderson acceleration) against Nw revolutions of'
+    print 'time marching from the rotor; vi difference relative to marching'
+
+    def run(comp):
+        t = best_time(comp.run, 1)
+        iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'Nw', 'dtheta', 'h', 'induction'):
+            setattr(iv, name, getattr(comp, name))
+        iv.run()
+        return t, iv.vi
+
+    print '%8s %4s %6s %8s %6s %6s %10s %10s %10s' % (
+        'case', 'Nw', 'h', 'solver', 'Nrev', 'Nvel', 'time [s]', 'residual',
+        'vi diff')
+    for case, Nw, h in (('default', 3, 1.5), ('default', 6, 1.5),
+                        ('design', 6, 1.5), ('design', 6, 100.)):
+        viMarch = None
+        for solver in ('march', 'periodic'):
+            comp = vortexRing() if case == 'default' else design_case(Nw=Nw)
+            comp.Nw = Nw
+            comp.h = h
+            comp.induction = 'elliptic'
+            comp.solver = solver
+            t, vi = run(comp)
+            if viMarch is None:
+                viMarch = vi
+            print '%8s %4d %6.1f %8s %6d %6d %10.3f %10.2e %10.2e' % (
+                case, Nw, h, solver, comp.Nrev, comp.Nvel, t, comp.residual,
+                relative_err(viMarch, vi))
+
+
+def bench_wake_length():
+    """ adaptive wake length on blade induced velocity convergence """
+    print 'Design case Ns=15 Nw=15, elliptic induction: disks used, run time'
+    print 'and blade vi error relative to the full wake'
+
+    def run(h, NwTol):
+        comp = design_case()
+        comp.h = h
+        comp.induction = 'elliptic'
+        comp.NwTol = NwTol
+        t = best_time(comp.run, 1)
+        iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'Nw', 'dtheta', 'h', 'induction'):
+            setattr(iv, name, getattr(comp, name))
+        iv.run()
+        return comp, t, iv.vi
+
+    print '%6s %6s %7s %10s %10s' % ('h', 'NwTol', 'NwUsed', 'time [s]', 'vi error')
+    for h in (1.5, 100.):
+        full, t, viFull = run(h, 0.)
+        print '%6.1f %6s %7d %10.3f %10s' % (h, '-', full.NwUsed, t, '-')
+        for NwTol in (0.02, 0.05, 0.1):
+            comp, t, vi = run(h, NwTol)
+            print '%6.1f %6.2f %7d %10.3f %10.2e' % (h, NwTol, comp.NwUsed, t,
+                                                    relative_err(viFull, vi))
+
+
+def bench_threads():
+    """ strong scaling of the threaded wake kernel """
+    print 'Ring-ring velocity for all rings of a synthetic Ns=30 Nw=30 wake,'
+    print 'Ntheta=40, on a thread pool (%d CPUs available)' % cpu_count()
+    args = wake_kernel_args(30, 30, 40)
+    print '%10s %8s %10s %8s %10s' % ('induction', 'threads', 'time [s]',
+                                      'speedup', 'efficiency')
+    for induction in ('quadrature', 'elliptic'):
+        serial = best_time(lambda: ringVelocity(*args, induction=induction))
+        print '%10s %8s %10.3f' % (induction, 'serial', serial)
+        for threads in (1, 2, 4, 8, 16, 32):
+            pool = ThreadPool(threads)
+            t = best_time(lambda: threadedVelocity(pool, threads, ringVelocity,
+                                                   *args, induction=induction))
+            pool.close()
+            print '%10s %8d %10.3f %8.2f %10.2f' % (induction, threads, t,
+                                                    serial / t,
+                                                    serial / t / threads)
+
+
+def bench_precision():
+    """ float32 quadrature temporaries against the float64 path """
+    print 'Single precision quadrature on the testvals case: blade vi and'
+    print 'ring-ring velocity errors relative to double precision, and'
+    print 'kernel time on a synthetic Ns=30 Nw=30 wake'
+    print '%7s %10s %10s %10s %12s %12s' % ('Ntheta', 'vi error', 'vr error',
+                                            'vz error', 'double [s]',
+                                            'single [s]')
+    for Ntheta in (20, 40, 200):
+        thetaArray, dtheta = theta_array(Ntheta)
+        vi = {}
+        for precision in ('double', 'single'):
+            comp = stored_induced_velocity(thetaArray=thetaArray, dtheta=dtheta,
+                                           precision=precision)
+            comp.run()
+            vi[precision] = comp.vi
+        args = (values.r, values.z, values.r[:, 1:], values.z[:, 1:],
+                values.Gamma[:, 1:], thetaArray, dtheta, values.cr, values.h)
+        double = ringVelocity(*args)
+        single = ringVelocity(*args, precision='single')
+
+        args = wake_kernel_args(30, 30, Ntheta)
+        tDouble = best_time(lambda: ringVelocity(*args))
+        tSingle = best_time(lambda: ringVelocity(*args, precision='single'))
+        print '%7d %10.2e %10.2e %10.2e %12.3f %12.3f' % (
+            Ntheta, relative_err(vi['double'], vi['single']),
+            relative_err(double[0], single[0]), relative_err(double[1], single[1]),
+            tDouble, tSingle)
+
+    print
+    print 'vortexRing on the testvals inputs, max ring position difference [m]'
+    wake = {}
+    for precision in ('double', 'single'):
+        comp = vortexRing()
+        for name in ('yN', 'rho', 'dT', 'vc', 'Omega', 'b', 'h', 'Nw', 'Ntt',
+                     'Ntheta', 'qh'):
+            setattr(comp, name, getattr(values, name))
+        comp.precision = precision
+        comp.run()
+        wake[precision] = (comp.z, comp.r)
+    print '%10.2e' % max(np.abs(d - s).max() for d, s in zip(wake['double'],
+                                                             wake['single']))
+
+
+def bench_cover():
+    """ cost of the root cover, with the cached influence matrix factorization """
+    print 'Design case Ns=15 Nw=15: run time with the cover over the root'
+    print 'elements inside ycmax, rebuilding the cover influence matrix on'
+    print 'every call or reusing its cached LU factorization'
+
+    def run(cover, ycmax=0., cached=True):
+        comp = design_case()
+        comp.cover = cover
+        comp.ycmax = ycmax
+        comp.run()
+
+        def again():
+            if not cached:
+                comp._coverCache = None
+            comp.run()
+        return best_time(again)
+
+    print '%6s %8s %12s %12s' % ('ycmax', 'covered', 'rebuilt [s]', 'cached [s]')
+    print '%6s %8d %12s %12.3f' % ('-', 0, '-', run(0))
+    for ycmax in (2., 4., 7.):
+        covered = np.sum(np.linspace(0, 10, 16) < ycmax)
+        print '%6.1f %8d %12.3f %12.3f' % (ycmax, covered,
+                                           run(1, ycmax, False), run(1, ycmax))
+
+
+def bench_history():
+    """ cost of recording the wake history to disk """
+    print 'Design case Ns=15 Nw=15: run time with the wake recorded at every'
+    print 'substep, and the size of the record'
+    path = tempfile.mkdtemp()
+    try:
+        print '%10s %10s %12s' % ('record', 'time [s]', 'size [MB]')
+        for historyPath in ('', path):
+            comp = design_case()
+            comp.historyPath = historyPath
+            t = best_time(comp.run)
+            size = sum(os.path.getsize(os.path.join(root, name))
+                       for root, dirs, names in os.walk(path) for name in names)
+            print '%10s %10.3f %12.2f' % (historyPath and 'on' or 'off', t,
+                                          size / 1e6)
+        t0 = time.time()
+        zMin = min(snapshot['z'].min() for snapshot in WakeHistory(path))
+        print 'lowest ring in the record %.2f m, read in %.3f s' % (
+            zMin, time.time() - t0)
+    finally:
+        shutil.rmtree(path)
+
+
+def bench_field():
+    """ off-body field of a solved wake on a 10^5 point grid """
+    print 'Design case Ns=15 Nw=15 at h=3: wakeField on a 400 x 250 (r, z)'
+    print 'grid, by induction model and memory cap'
+    print '%11s %12s %10s' % ('induction', 'maxBytes', 'time [s]')
+    yp, zp = np.meshgrid(np.linspace(0, 20, 400), np.linspace(-3, 2, 250))
+    points = np.column_stack((yp.ravel(), zp.ravel()))
+    for induction in ('quadrature', 'elliptic'):
+        comp = design_case()
+        comp.h = 3.
+        comp.induction = induction
+        comp.run()
+        for maxBytes in (2 ** 20, 2 ** 22, 2 ** 26):
+            t = best_time(lambda: wakeField(comp, points, maxBytes), 1)
+            print '%11s %12d %10.2f' % (induction, maxBytes, t)
+
+
+def bench_influence():
+    """ inducedVelocity with a new wake against new circulation only """
+    print 'inducedVelocity on a synthetic Ns=30 Nw=30 wake, Ntheta=40: time'
+    print 'with a new wake geometry (direct sum), with the same geometry a'
+    print 'second time (matrix built) and with only Gamma changed (cached'
+    print 'matrix), against the tree evaluator which keeps no matrix'
+    thetaArray, dtheta = theta_array(40)
+    r, z, Gamma = synthetic_wake(30, 30)
+    print '%10s %12s %12s %12s' % ('evaluator', 'new wake [s]', 'matrix [s]',
+                                   'Gamma [s]')
+    for evaluator in ('direct', 'tree'):
+        comp = stored_induced_velocity(
+            qh=np.zeros(31), Gamma=Gamma, z=z, r=r, thetaArray=thetaArray,
+            dtheta=dtheta, yE=0.5 * (r[0, 1:] + r[0, :-1]), Ns=30, Nw=30,
+            evaluator=evaluator, treeThreshold=0)
+        tWake = tMatrix = np.inf
+        for i in range(3):
+            comp.z = comp.z - 0.01
+            tWake = min(tWake, best_time(comp.run, 1))
+            tMatrix = min(tMatrix, best_time(comp.run, 1))
+
+        def newGamma():
+            comp.Gamma = 1.01 * comp.Gamma
+            comp.run()
+        print '%10s %12.4f %12.4f %12.4f' % (evaluator, tWake, tMatrix,
+                                             best_time(newGamma))
+
+
+def bench_shed():
+    """ cost of shedding a disk: row-by-row shift against the ring buffer """
+    print 'Time per revolution to shed a disk and clear the velocity work'
+    print 'arrays, Ns=15: the row-by-row shift with new vz, vr arrays (as'
+    print 'before), against the windowed buffers of vortexRing'
+    print '%6s %12s %12s' % ('Nw', 'shift [us]', 'buffer [us]')
+    Ns = 15
+    for Nw in (15, 100, 1000):
+        rows = Nw + 1
+
+        def shift():
+            Gamma = np.zeros((rows, Ns + 1))
+            r = np.zeros((rows, Ns + 1))
+            z = np.zeros((rows, Ns + 1))
+            for t in range(1, Nw + 1):
+                vz = np.zeros((rows, Ns + 1))
+                vr = np.zeros((rows, Ns + 1))
+                for i in range(1, t + 1)[::-1]:
+                    Gamma[i, :] = Gamma[i - 1, :]
+                    r[i, :] = r[i - 1, :]
+                    z[i, :] = z[i - 1, :]
+
+        def ring():
+            buffers = np.zeros((3, rows + Nw, Ns + 1))
+            head = Nw
+            for t in range(1, Nw + 1):
+                head -= 1
+                Gamma, r, z = buffers[:, head:head + rows]
+
+        print '%6d %12.1f %12.1f' % (Nw, best_time(shift) / Nw * 1e6,
+                                     best_time(ring) / Nw * 1e6)
+
+
+def bench_merge():
+    """ ring amalgamation in the far wake """
+    print 'Design case Ns=15 out of ground effect (h=100), elliptic induction:'
+    print 'rings merged, rings left with circulation, run time and blade vi'
+    print 'error relative to the unmerged wake'
+
+    def run(Nw, mergeDistance, mergeTol=2.):
+        comp = design_case(Nw=Nw)
+        comp.h = 100.
+        comp.induction = 'elliptic'
+        comp.mergeDistance = mergeDistance
+        comp.mergeTol = mergeTol
+        t = best_time(comp.run, 1)
+        iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'Nw', 'dtheta', 'h', 'induction'):
+            setattr(iv, name, getattr(comp, name))
+        iv.run()
+        return comp, t, iv.vi
+
+    print '%4s %9s %9s %8s %7s %9s %9s' % ('Nw', 'distance', 'mergeTol',
+                                          'Nmerged', 'active', 'time [s]',
+                                          'vi error')
+    for Nw in (15, 30):
+        full, t, viFull = run(Nw, 0.)
+        print '%4d %9s %9s %8d %7d %9.3f %9s' % (
+            Nw, '-', '-', 0, (full.Gamma[1:, 1:] != 0).sum(), t, '-')
+        for mergeDistance, mergeTol in ((20., 2.), (10., 2.), (10., 4.)):
+            comp, t, vi = run(Nw, mergeDistance, mergeTol)
+            print '%4d %9.1f %9.1f %8d %7d %9.3f %9.2e' % (
+                Nw, mergeDistance, mergeTol, comp.Nmerged,
+                (comp.Gamma[1:, 1:] != 0).sum(), t, relative_err(viFull, vi))
+
+
+def bench_adaptive():
+    """ per-pair Gauss-Legendre points against the uniform midpoint rule """
+    print 'Kernel time on a synthetic Ns=30 Nw=30 wake and velocity error of'
+    print 'the adaptive rule relative to the midpoint rule with Ntheta points'
+    print '%7s %10s %10s %10s %10s' % ('Ntheta', 'quad [s]', 'adapt [s]',
+                                       'vr error', 'vz error')
+    for Ntheta in (20, 40, 80):
+        args = wake_kernel_args(30, 30, Ntheta)
+        quad = ringVelocity(*args)
+        adapt = ringVelocity(*args, induction='adaptive')
+        print '%7d %10.3f %10.3f %10.2e %10.2e' % (
+            Ntheta, best_time(lambda: ringVelocity(*args)),
+            best_time(lambda: ringVelocity(*args, induction='adaptive')),
+            relative_err(quad[0], adapt[0]), relative_err(quad[1], adapt[1]))
+
+    print
+    print 'vortexRing on the testvals inputs: run time and max ring position'
+    print 'difference [m] to the midpoint rule'
+    print '%7s %10s %10s %10s' % ('Ntheta', 'quad [s]', 'adapt [s]', 'dz [m]')
+    for Ntheta in (20, 40):
+        wake = {}
+        times = {}
+        for induction in ('quadrature', 'adaptive'):
+            comp = vortexRing()
+            for name in ('yN', 'rho', 'dT', 'vc', 'Omega', 'b', 'h', 'Nw',
+                         'Ntt', 'qh'):
+                setattr(comp, name, getattr(values, name))
+            comp.Ntheta = Ntheta
+            comp.induction = induction
+            times[induction] = best_time(comp.run)
+            wake[induction] = comp.z
+        print '%7d %10.3f %10.3f %10.2e' % (
+            Ntheta, times['quadrature'], times['adaptive'],
+            np.abs(wake['quadrature'] - wake['adaptive']).max())
+
+
+def kernel_run(Ns, Nw, Ntheta, maxBytes):
+    """
+    wall-clock time [s] and peak resident memory [MB] of ringVelocity on a
+    synthetic wake with tiles of maxBytes, in a fresh interpreter
+    """
+    script = '; '.join((
+        'import resource, time',
+        'from vortex_benchmarks import wake_kernel_args',
+        'from Atlas.vortex import ringVelocity',
+        'args = wake_kernel_args(%d, %d, %d)' % (Ns, Nw, Ntheta),
+        't0 = time.time()',
+        'ringVelocity(*args, maxBytes=%d)' % maxBytes,
+        'print time.time() - t0, '
+        'resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.'))
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        out = subprocess.check_output([sys.executable, '-c', script], cwd=here,
+                                      stderr=subprocess.STDOUT)
+    except subprocess.CalledProcessError:
+        return np.nan, np.nan
+    return [float(x) for x in out.split()[-2:]]
+
+
+def bench_tiles():
+    """ tiled ring kernels against a single broadcast of all pairs """
+    print 'ringVelocity of a synthetic wake on itself: time and peak memory'
+    print 'with 4 MB tiles and with one broadcast (nan where it fails)'
+    print '%4s %4s %7s %12s %12s %12s %12s' % ('Ns', 'Nw', 'Ntheta',
+                                               'tiled [s]', 'whole [s]',
+                                               'tiled [MB]', 'whole [MB]')
+    for Ns, Nw, Ntheta in ((15, 15, 40), (30, 15, 40), (30, 30, 40),
+                           (60, 30, 40)):
+        tTiled, mTiled = kernel_run(Ns, Nw, Ntheta, 2 ** 22)
+        tWhole, mWhole = kernel_run(Ns, Nw, Ntheta, 2 ** 40)
+        print '%4d %4d %7d %12.3f %12.3f %12.1f %12.1f' % (
+            Ns, Nw, Ntheta, tTiled, tWhole, mTiled, mWhole)
+
+    print
+    print 'Ns=30 Nw=30 Ntheta=40 kernel time against the tile budget'
+    print '%12s %10s' % ('budget [MB]', 'time [s]')
+    args = wake_kernel_args(30, 30, 40)
+    for maxBytes in (2 ** 18, 2 ** 20, 2 ** 22, 2 ** 24, 2 ** 26):
+        print '%12.2f %10.3f' % (maxBytes / 2. ** 20, best_time(
+            lambda: ringVelocity(*args, maxBytes=maxBytes)))
+
+
+benchmarks = [
+    ('induction', bench_induction),
+    ('tree', bench_tree),
+    ('freeze', bench_freeze),
+    ('integrators', bench_integrators),
+    ('warm', bench_warm),
+    ('periodic', bench_periodic),
+    ('wakelength', bench_wake_length),
+    ('threads', bench_threads),
+    ('precision', bench_precision),
+    ('cover', bench_cover),
+    ('history', bench_history),
+    ('field', bench_field),
+    ('influence', bench_influence),
+    ('shed', bench_shed),
+    ('merge', bench_merge),
+    ('adaptive', bench_adaptive),
+    ('tiles', bench_tiles),
+]
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or [name for name, fn in benchmarks]
+    for name, fn in benchmarks:
+        if name in names:
+            print '=' * 70
+            fn()
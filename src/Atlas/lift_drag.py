@@ -1,12 +1,17 @@
 # pylint: disable=line-too-long, invalid-name, bad-whitespace, trailing-whitespace, too-many-locals, line-too-long
 # Partially autogenerated with SMOP version 0.22
 # /OpenMDAO/dev/hschilli/latest/devenv/bin/smop lift_drag.m -o lift_drag.py
-import math
+import logging
 import numpy as np
 
 from openmdao.lib.datatypes.api import Int, Float, Array, VarTree
 from openmdao.main.api import Component, VariableTree
 
+from properties import wireGeometry
+
+# per-element diagnostics of liftDrag, at DEBUG level
+_logger = logging.getLogger(__name__)
+
 class Fblade(VariableTree):
     Fx = Array(desc='')
     Fz = Array(desc='')
@@ -17,6 +22,16 @@ class Fblade(VariableTree):
     Pp = Array(desc='')
 
 
+def batchCondition(value, batch):
+    """
+    An operating condition against the elements: the scalar value, or the
+    conditions of batch as a column, giving arrays with a row per condition
+    """
+    if len(batch):
+        return np.asarray(batch, dtype=float).reshape(-1, 1)
+    return value
+
+
 class liftDrag(Component):
     """
     Computes drag coefficient
@@ -42,6 +57,13 @@ class liftDrag(Component):
     chordFrac = Array( iotype='in', desc='description')
     Cm = Array( iotype='in', desc='description')
     xtU = Array( iotype='in', desc='description')
+    xtL = Array( iotype='in', desc='description')
+
+    # operating conditions evaluated together, in place of the scalars
+    OmegaBatch = Array(np.zeros(0), iotype='in', desc='rotor speeds, one per condition (empty - Omega)')
+    vcBatch = Array(np.zeros(0), iotype='in', desc='climb velocities, one per condition (empty - vc)')
+    vwBatch = Array(np.zeros(0), iotype='in', desc='wind velocities, one per condition (empty - vw)')
+    rhoBatch = Array(np.zeros(0), iotype='in', desc='air densities, one per condition (empty - rho); with any batch, vi may have a row per condition and the outputs have one')
    
     Re = Array( iotype='out', desc='description')
     Cd = Array( iotype='out', desc='description')
@@ -53,54 +75,50 @@ class liftDrag(Component):
 
     def execute(self):
 
-        # Pre-allocate output arrays
-        self.Re = np.zeros(self.Ns)
-        self.Cd = np.zeros(self.Ns)
-        self.phi = np.zeros(self.Ns)
-        self.Fblade.Fx = np.zeros(self.Ns)
-        self.Fblade.Fz = np.zeros(self.Ns)
-        self.Fblade.My = np.zeros(self.Ns)
-        self.Fblade.Q = np.zeros(self.Ns)
-        self.Fblade.P = np.zeros(self.Ns)
-        self.Fblade.Pi = np.zeros(self.Ns)
-        self.Fblade.Pp = np.zeros(self.Ns)
-
-        for s in range(1,(self.Ns+1)):
-            U = math.sqrt((self.Omega * self.r[(s-1)] + self.vw) ** 2 + (self.vc + self.vi[(s-1)]) ** 2)
-            if self.c[(s-1)] > 0.001:
-                self.Re[(s-1)] = self.rho * U * self.c[(s-1)] / self.visc
-                self.Cd[(s-1)] = self.dragCoefficientFit(self.Re[(s-1)],self.t[(s-1)],self.xtU[(s-1)],self.xtL[(s-1)])
-                dL = 0.5 * self.rho * U ** 2 * self.Cl[(s-1)] * self.c[(s-1)] * self.dr[(s-1)]
-                dD = 0.5 * self.rho * U ** 2 * self.Cd[(s-1)] * self.c[(s-1)] * self.dr[(s-1)]
-            else:
-                self.Re[(s-1)] = self.rho * U * self.d[(s-1)] / self.visc
-                if self.Re < 3500:
-                    self.Cd[(s-1)] = - 1e-10 * self.Re[(s-1)] ** 3 + 7e-07 * self.Re[(s-1)] ** 2 - 0.0013 * self.Re[(s-1)] + 1.7397
-                else:
-                    self.Cd[(s-1)] = 1
-                dL = 0
-                dD = 0.5 * self.rho * U ** 2 * self.Cd[(s-1)] * self.d[(s-1)] * self.dr[(s-1)]
-            for w in range(1,(max(self.yWire.shape)+1)):
-                if self.yN[(s-1)] < self.yWire[(w-1)]:
-                    if self.yN[(s + 1-1)] < self.yWire[(w-1)]:
-                        L = self.dr[(s-1)] * math.sqrt(self.zWire ** 2 + self.yWire[(w-1)] ** 2) / self.yWire[(w-1)]
-                    else:
-                        L = (self.yWire[(w-1)] - self.yN[(s-1)]) * math.sqrt(self.zWire ** 2 + self.yWire[(w-1)] ** 2) / self.yWire[(w-1)]
-                    ReWire = self.rho * U * self.tWire / self.visc
-                    CdWire = - 1e-10 * ReWire ** 3 + 7e-07 * ReWire ** 2 - 0.0013 * ReWire + 1.7397
-                    dD = dD + 0.5 * self.rho * U ** 2 * CdWire * self.tWire * L
-            self.phi[(s-1)] = math.atan2(self.vc + self.vi[(s-1)],self.vw + self.Omega * self.r[(s-1)])
-            print "*" * 10
-            print self.vc,self.vi[(s-1)], self.vw, self.Omega, self.r[(s-1)], self.phi[(s-1)]
-            print "*" * 10
-            self.Fblade.Fz[s-1] = self.chordFrac[(s-1)] * (dL * math.cos(self.phi[(s-1)]) - dD * math.sin(self.phi[(s-1)]))
-            self.Fblade.Fx[s-1] = self.chordFrac[(s-1)] * (dD * math.cos(self.phi[(s-1)]) + dL * math.sin(self.phi[(s-1)]))
-            self.Fblade.My[s-1] = self.chordFrac[(s-1)] * (0.5 * self.rho * U ** 2 * self.Cm[(s-1)] * self.c[(s-1)] * self.c[(s-1)] * self.dr[(s-1)])
-            self.Fblade.Q[s-1] = self.Fblade.Fx[s-1] * self.r[(s-1)]
-            self.Fblade.P[s-1] = self.Fblade.Q[s-1] * self.Omega
-            self.Fblade.Pi[s-1] = self.chordFrac[(s-1)] * (dL * math.sin(self.phi[(s-1)]) * self.r[(s-1)] * self.Omega)
-            self.Fblade.Pp[s-1] = self.chordFrac[(s-1)] * (dD * math.cos(self.phi[(s-1)]) * self.r[(s-1)] * self.Omega)
-   
+        Ns = self.Ns
+        r = self.r[:Ns]
+        vi = self.vi[..., :Ns]
+        c = self.c[:Ns]
+        dr = self.dr[:Ns]
+        Omega = batchCondition(self.Omega, self.OmegaBatch)
+        vc = batchCondition(self.vc, self.vcBatch)
+        vw = batchCondition(self.vw, self.vwBatch)
+        rho = batchCondition(self.rho, self.rhoBatch)
+
+        U = np.sqrt((Omega * r + vw) ** 2 + (vc + vi) ** 2)
+        q = 0.5 * rho * U ** 2
+
+        # wing sections, and the spar (a cylinder of diameter d) where the
+        # chord vanishes at the root
+        wing = c > 0.001
+        width = np.where(wing, c, self.d[:Ns])
+        self.Re = rho * U * width / self.visc
+        CdSpar = np.where(self.Re < 3500, - 1e-10 * self.Re ** 3 + 7e-07 * self.Re ** 2 - 0.0013 * self.Re + 1.7397, 1.)
+        self.Cd = np.where(wing, self.dragCoefficientFit(self.Re, self.t[:Ns], self.xtU[:Ns], self.xtL[:Ns]), CdSpar)
+        dL = np.where(wing, q * self.Cl[:Ns] * c * dr, 0.)
+        dD = q * self.Cd * width * dr
+
+        # drag of the wires over the elements inboard of their attachment
+        if len(self.yWire):
+            L = wireGeometry(self.yN, self.yWire, self.zWire).exposed[:Ns]
+            ReWire = rho * U * self.tWire / self.visc
+            CdWire = - 1e-10 * ReWire ** 3 + 7e-07 * ReWire ** 2 - 0.0013 * ReWire + 1.7397
+            dD = dD + q * CdWire * self.tWire * L
+
+        self.phi = np.arctan2(vc + vi, vw + Omega * r)
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug('vc %s, vw %s, Omega %s\nvi %s\nr %s\nphi %s', vc, vw, Omega, vi, r, self.phi)
+
+        cosPhi = np.cos(self.phi)
+        sinPhi = np.sin(self.phi)
+        chordFrac = self.chordFrac[:Ns]
+        self.Fblade.Fz = chordFrac * (dL * cosPhi - dD * sinPhi)
+        self.Fblade.Fx = chordFrac * (dD * cosPhi + dL * sinPhi)
+        self.Fblade.My = chordFrac * (q * self.Cm[:Ns] * c * c * dr)
+        self.Fblade.Q = self.Fblade.Fx * r
+        self.Fblade.P = self.Fblade.Q * Omega
+        self.Fblade.Pi = chordFrac * (dL * sinPhi * r * Omega)
+        self.Fblade.Pp = chordFrac * (dD * cosPhi * r * Omega)
 
 
     def dragCoefficientFit(self, Re, t, xtU, xtL):
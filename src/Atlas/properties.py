@@ -127,6 +127,57 @@ wireProperties =  {
 }
 
 
+class WireGeometry(object):
+    """
+    Where the lift wires, from the attachments at yWire along the span to
+    zWire below the root, lie over the elements between the nodes yN:
+        length  - length of each wire
+        exposed - length of wire over each element, summed over the wires
+        element - element containing each attachment (-1 - off the span)
+        aL      - local coordinate a/L of each attachment in its element
+        theta   - angle of each wire to the span
+    """
+
+    def __init__(self, yN, yWire, zWire):
+        yN = np.asarray(yN, dtype=float).ravel()
+        yWire = np.asarray(yWire, dtype=float).ravel()
+        self.theta = np.arctan2(zWire, yWire)
+        self.length = np.sqrt(zWire**2 + yWire**2)
+
+        # each wire runs over the elements from the root to its attachment
+        lo = yN[:-1]
+        hi = yN[1:]
+        secant = (self.length / yWire)[:, np.newaxis]
+        overlap = np.maximum(np.minimum(hi, yWire[:, np.newaxis]) - lo, 0)
+        self.exposed = (overlap * secant).sum(axis=0)
+
+        element = np.searchsorted(yN, yWire, side='right') - 1
+        onSpan = (element >= 0) & (element < lo.size)
+        self.element = np.where(onSpan, element, -1)
+        self.aL = np.zeros(yWire.size)
+        e = element[onSpan]
+        self.aL[onSpan] = (yWire[onSpan] - lo[e]) / (hi[e] - lo[e])
+
+
+_wireGeometryCache = {}
+
+
+def wireGeometry(yN, yWire, zWire):
+    """
+    WireGeometry of the nodes yN and wires (yWire, zWire), built once for
+    each set of values and shared by the aerodynamic, mass and FEM models
+    """
+    yN = np.asarray(yN, dtype=float).ravel()
+    yWire = np.asarray(yWire, dtype=float).ravel()
+    key = (yN.tobytes(), yWire.tobytes(), float(zWire))
+    geometry = _wireGeometryCache.get(key)
+    if geometry is None:
+        if len(_wireGeometryCache) >= 16:
+            _wireGeometryCache.clear()
+        geometry = _wireGeometryCache[key] = WireGeometry(yN, yWire, zWire)
+    return geometry
+
+
 class SparProperties(Component):
     """ Computes the structural properties of a CFRP spar given the diameter, d,
         wrap angle, theta, number of tube layers, nTube, and number of cap
@@ -6,7 +6,7 @@ from openmdao.main.api import Assembly, Component, VariableTree
 from openmdao.lib.datatypes.api import Int, Float, Array, VarTree, Str, Enum
 
 from properties import SparProperties, ChordProperties, \
-                       wireProperties, prepregProperties
+                       wireProperties, prepregProperties, wireGeometry
 from lift_drag import Fblade
 
 
@@ -164,6 +164,7 @@ class MassProperties(Component):
     ycmax    = Float(iotype='in', desc='')
 
     # inputs for wire
+    yN      = Array(iotype='in', desc='node locations')
     yWire   = Array(iotype='in', desc='location of wire attachment along span')
     zWire   = Float(iotype='in', desc='depth of wire attachement')
     tWire   = Float(iotype='in', desc='thickness of wire')
@@ -189,7 +190,7 @@ class MassProperties(Component):
 
         wire_props = wireProperties[self.flags.WireType]
 
-        LWire = sqrt(self.zWire**2 + self.yWire**2)
+        LWire = wireGeometry(self.yN, self.yWire, self.zWire).length
         mWire = pi * (self.tWire / 2)**2 * wire_props['RHO'] * LWire
 
         if self.flags.Quad:
@@ -270,6 +271,9 @@ class FEM(Component):
         # Create global stiffness maxtrix and force vector
         k = np.zeros((12, 12, Ns))
 
+        # where the wires attach
+        wires = wireGeometry(yN, yWire, zWire)
+
         for s in range(0, Ns):
 
             # Local elastic stiffness matrix
@@ -345,27 +349,18 @@ class FEM(Component):
                 Fg[5] = 0
 
                 # Wire forces (using consistent force vector)
-                for w in range(0, len(yWire)):
-                    if (yWire[w] >= yN[s]) and (yWire[w] < yN[s+1]):
-                        thetaWire = atan2(zWire, yWire[w])
-                        a = yWire[w] - yN[s]
-                        L = dy[s]
-                        FxWire = -cos(thetaWire) * TWire[w]
-                        FzWire = -sin(thetaWire) * TWire[w]
-                        Fwire[0] = 0
-                        Fwire[1] = FxWire * (1 - a / L)
-                        Fwire[2] = FzWire * (2 * (a / L)**3 - 3 * (a / L)**2 + 1)
-                        Fwire[3] = FzWire * a * ((a / L)**2 - 2 * (a / L) + 1)
-                        Fwire[4] = 0
-                        Fwire[5] = 0
-                        Fwire[6] = 0
-                        Fwire[7] = FxWire * (a / L)
-                        Fwire[8] = FzWire * (- 2 * (a / L)**3 + 3 * (a / L)**2)
-                        Fwire[9] = FzWire * a * ((a / L)**2 - (a / L))
-                        Fwire[10] = 0
-                        Fwire[11] = 0
-                    else:
-                        Fwire = np.zeros((12, 1))
+                L = dy[s]
+                for w in np.flatnonzero(wires.element == s):
+                    aL = wires.aL[w]
+                    a = aL * L
+                    FxWire = -cos(wires.theta[w]) * TWire[w]
+                    FzWire = -sin(wires.theta[w]) * TWire[w]
+                    Fwire[1] += FxWire * (1 - aL)
+                    Fwire[2] += FzWire * (2 * aL**3 - 3 * aL**2 + 1)
+                    Fwire[3] += FzWire * a * (aL**2 - 2 * aL + 1)
+                    Fwire[7] += FxWire * aL
+                    Fwire[8] += FzWire * (- 2 * aL**3 + 3 * aL**2)
+                    Fwire[9] += FzWire * a * (aL**2 - aL)
 
             Fpres = np.zeros((12, 1))
 
@@ -1059,6 +1054,7 @@ class Structures(Assembly):
         self.connect('quad.mQuad',     'mass.mQuad')
         self.connect('xEA',            'mass.xEA')
         self.connect('ycmax',          'mass.ycmax')
+        self.connect('yN',             'mass.yN')
         self.connect('zWire',          'mass.zWire')
         self.connect('yWire',          'mass.yWire')
         self.connect('tWire',          'mass.tWire')
@@ -1,4 +1,6 @@
 from Atlas import dragCoefficient, frictionCoefficient
+from Atlas.coefficients import frictionTable
+import numpy as np
 import unittest
 from openmdao.util.testutil import assert_rel_error
 
@@ -10,22 +12,15 @@ class AtlasTestCase(unittest.TestCase):
 
     def test_dragCoefficient(self):
         comp = dragCoefficient()
-        comp.Re = 4.7632e5
-        comp.tc = 0.15
-        comp.xtcU = 0.15
-        comp.xtcL = 0.15
+        comp.Re = np.array([4.7632e5, 4.7632e5])
+        comp.tc = np.array([0.15, 0.15])
+        comp.xtcU = np.array([0.15, 0.5])
+        comp.xtcL = np.array([0.15, 1.])
 
         comp.run()
 
-        assert_rel_error(self, comp.Cd, 0.013329, self.tol)
-
-        comp.Re = 4.7632e5
-        comp.tc = 0.15
-        comp.xtcU = 0.5
-        comp.xtcL = 1
-
-        comp.run()
-        assert_rel_error(self, comp.Cd, 0.0077468, self.tol)
+        assert_rel_error(self, comp.Cd[0], 0.013329, self.tol)
+        assert_rel_error(self, comp.Cd[1], 0.0077468, self.tol)
 
     # def test_dragCoefficientFit(self):
     #     comp = dragCoefficientFit()
@@ -58,6 +53,37 @@ class AtlasTestCase(unittest.TestCase):
 
         assert_rel_error(self, Cfflat, 0.0019241, self.tol)
 
+    def test_frictionCoefficientArray(self):
+        # turbulent, partially laminar and laminar elements in one call
+        Re = np.array([[2e5], [5e5], [3e6]])
+        xtc = np.array([0., 0.013, 0.5, 0.999, 1.])
+        Cfflat = frictionCoefficient(Re, xtc)
+
+        self.assertEqual(Cfflat.shape, (3, 5))
+        for i in range(3):
+            for j in range(5):
+                self.assertEqual(Cfflat[i, j], frictionCoefficient(Re[i, 0], xtc[j]))
+        self.assertTrue(np.isscalar(frictionCoefficient(5e5, 0.5)))
+
+    def test_frictionTable(self):
+        table = frictionTable()
+        Re = np.exp(np.linspace(np.log(1e4), np.log(1e7), 97))[:, np.newaxis]
+        xtc = np.array([0., 1e-4, 0.013, 0.15, 0.3, 0.5, 0.77, 0.999, 1.])
+        exact = frictionCoefficient(Re, xtc)
+        self.assertTrue((np.abs(table(Re, xtc) - exact) < 2e-4 * exact).all())
+
+        # outside the table the formula is used
+        self.assertEqual(table(2e7, 0.5), frictionCoefficient(2e7, 0.5))
+
+        comp = dragCoefficient()
+        comp.Re = np.array([4.7632e5])
+        comp.tc = np.array([0.15])
+        comp.xtcU = np.array([0.5])
+        comp.xtcL = np.array([1.])
+        comp.table = 1
+        comp.run()
+        assert_rel_error(self, comp.Cd[0], 0.0077468, self.tol)
+
 
 if __name__ == "__main__":
     unittest.main()
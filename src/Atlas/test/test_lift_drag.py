@@ -46,6 +46,7 @@ class AtlasTestLiftDrag(unittest.TestCase):
                                     1.00000, 1.00000 ])
         comp.Cm = - np.array([0.1500, 0.1494, 0.1330, 0.1200, 0.1200,
                               0.1200, 0.1200, 0.1200, 0.1200, 0.1200])
+        self.comp = comp
         comp.run()
 
         tol = 5e-4
@@ -80,6 +81,51 @@ class AtlasTestLiftDrag(unittest.TestCase):
         Re = np.array([ 9.4000e+03, 1.4362e+05, 2.0239e+05, 2.4506e+05, 2.7293e+05, 2.8751e+05, 2.9077e+05, 2.8499e+05, 2.7266e+05, 2.5631e+05 ] )
         self.assertLess(relative_err(Re, comp.Re), tol)
 
+    def test_spar(self):
+        # elements without chord are spar, with the cylinder drag switching
+        # at Re = 3500 element by element
+        self.test_liftDrag()
+        comp = self.comp
+        comp.c = comp.c.copy()
+        comp.c[:2] = 0.
+        comp.d = comp.d.copy()
+        comp.d[0] = 0.003
+        comp.run()
+        self.assertLess(comp.Re[0], 3500)
+        self.assertGreater(comp.Re[1], 3500)
+        Re = comp.Re[0]
+        self.assertAlmostEqual(comp.Cd[0], - 1e-10 * Re ** 3 + 7e-07 * Re ** 2 - 0.0013 * Re + 1.7397)
+        self.assertEqual(comp.Cd[1], 1.)
+        self.assertTrue((comp.Fblade.Pi[:2] == 0).all())
+
+    def test_batch(self):
+        # a row per operating condition, as from a run at each condition
+        self.test_liftDrag()
+        comp = self.comp
+        Omega = np.array([0.8, 1.0367, 1.3])
+        vc = np.array([0., 0.1, 0.2])
+        vi = np.array([comp.vi * 0.9, comp.vi, comp.vi * 1.1])
+        comp.OmegaBatch = Omega
+        comp.vcBatch = vc
+        comp.vi = vi
+        comp.run()
+        batch = dict((name, getattr(comp.Fblade, name)) for name in ('Fx', 'Fz', 'My', 'Q', 'P', 'Pi', 'Pp'))
+        batch.update((name, getattr(comp, name)) for name in ('Re', 'Cd', 'phi'))
+        self.assertEqual(batch['Fz'].shape, (3, comp.Ns))
+
+        comp.OmegaBatch = np.zeros(0)
+        comp.vcBatch = np.zeros(0)
+        for i in range(3):
+            comp.Omega = Omega[i]
+            comp.vc = vc[i]
+            comp.vi = vi[i]
+            comp.run()
+            for name in ('Fx', 'Fz', 'My', 'Q', 'P', 'Pi', 'Pp'):
+                self.assertLess(absolute_err(getattr(comp.Fblade, name), batch[name][i]), 1e-12)
+            for name in ('Re', 'Cd', 'phi'):
+                self.assertLess(relative_err(getattr(comp, name), batch[name][i]), 1e-12)
+
+
 if __name__ == "__main__":
     unittest.main()
     
@@ -1,4 +1,5 @@
 from Atlas import DiscretizeProperties, wireProperties, SparProperties, ChordProperties
+from Atlas.properties import wireGeometry
 import numpy as np
 import unittest
 
@@ -158,6 +159,25 @@ class AtlasTestProperties(unittest.TestCase):
             assert_rel_error(self, comp.mChord[i], e_mChord, tol)
             assert_rel_error(self, comp.xCGChord[i], e_xCGChord, tol)
 
+    def test_wireGeometry(self):
+        yN = np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+        yWire = np.array([5.8852, 3., 12.])
+        zWire = 1.0
+        wires = wireGeometry(yN, yWire, zWire)
+        self.assertTrue(wires is wireGeometry(yN.copy(), yWire.copy(), zWire))
+
+        self.assertLess(relative_err(np.sqrt(zWire**2 + yWire**2), wires.length), 1e-12)
+        self.assertEqual(list(wires.element), [5, 3, -1])
+        self.assertLess(absolute_err(np.array([0.8852, 0., 0.]), wires.aL), 1e-12)
+
+        # each wire's length is spread over the elements inboard of it
+        exposed = np.zeros(10)
+        for y in yWire:
+            overlap = np.clip(np.minimum(yN[1:], y) - yN[:-1], 0, None)
+            exposed += overlap * np.sqrt(zWire**2 + y**2) / y
+        self.assertLess(relative_err(exposed, wires.exposed), 1e-12)
+        self.assertAlmostEqual(wires.exposed.sum(), wires.length[:2].sum() + 10 * wires.length[2] / 12)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -102,6 +102,14 @@ class ThrustTestCase(unittest.TestCase):
         comp.execute()
         assert_rel_error(self, comp.chordFrac, chordFrac, 1e-4)
         assert_rel_error(self, comp.dT, dT, 1e-4)
+
+        # a row of dT per operating condition
+        comp.OmegaBatch = np.array([0.5, 1.0367, 2.])
+        comp.rhoBatch = np.array([1.18, 1.18, 1.])
+        comp.execute()
+        self.assertEqual(comp.dT.shape, (3, 10))
+        for i, scale in enumerate([(0.5 / 1.0367) ** 2, 1., (2. / 1.0367) ** 2 / 1.18]):
+            assert_rel_error(self, comp.dT[i], dT * scale, 1e-4)
     
 if __name__ == "__main__":
     unittest.main()
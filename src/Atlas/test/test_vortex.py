@@ -1,6 +1,14 @@
 from testvals import values
 from Atlas import vortexRing, inducedVelocity
+from Atlas.vortex import ringVelocity, treeRingVelocity, cylinderVelocity, \
+                         marchWake, andersonSolve, threadedVelocity, \
+                         WakeHistory, wakeField, ringInfluence, mergeRings, \
+                         prescribedWake
+from multiprocessing.pool import ThreadPool
 import numpy as np
+import os
+import shutil
+import tempfile
 import unittest
 
 
@@ -70,5 +78,591 @@ class Test_inducedVelocity(unittest.TestCase):
         assert relative_err(comp.vi, values.vi) < 1e-7
 
 
+class Test_ringVelocity(unittest.TestCase):
+
+    def test_axis(self):
+        # on the axis of an isolated ring vz = -Gamma r^2 / (2 (r^2 + dz^2)^1.5)
+        for induction in ('quadrature', 'elliptic', 'adaptive'):
+            vr, vz = ringVelocity(np.array([0.]), np.array([2.]),
+                                  np.array([3.]), np.array([0.]), np.array([1.]),
+                                  values.thetaArray, values.dtheta, values.cr,
+                                  1e8, induction=induction)
+            assert abs(vr[0]) < 1e-9
+            assert abs(vz[0] + 9. / (2 * 13 ** 1.5)) < 1e-12
+
+    def test_elliptic(self):
+        # closed form agrees with a converged quadrature, including pairs
+        # inside the core radius
+        rng = np.random.RandomState(0)
+        yp = rng.uniform(0, 12, 100)
+        zp = rng.uniform(-3, 3, 100)
+        r = rng.uniform(0.5, 12, 80)
+        zr = rng.uniform(-3, 3, 80)
+        Gamma = rng.randn(80)
+        Ntheta = 4000
+        dtheta = np.pi / Ntheta
+        thetaArray = np.linspace(dtheta / 2, np.pi - dtheta / 2, Ntheta)
+
+        # also with targets on the far side of the axis
+        for side in (1, -1):
+            quad = ringVelocity(side * yp, zp, r, zr, Gamma, thetaArray, dtheta,
+                                0.5, 1.5)
+            ell = ringVelocity(side * yp, zp, r, zr, Gamma, thetaArray, dtheta,
+                               0.5, 1.5, induction='elliptic')
+            assert relative_err(quad[0], ell[0]) < 1e-10
+            assert relative_err(quad[1], ell[1]) < 1e-10
+
+    def test_adaptive(self):
+        # fewer points away from the core match the quadrature, also with
+        # targets on the far side of the axis
+        args = (values.r, values.z, values.r[:, 1:], values.z[:, 1:],
+                values.Gamma[:, 1:])
+        for Ntheta in (20, 80):
+            dtheta = np.pi / Ntheta
+            thetaArray = np.linspace(dtheta / 2, np.pi - dtheta / 2, Ntheta)
+            for side in (1, -1):
+                yp = side * args[0]
+                quad = ringVelocity(yp, *(args[1:] + (thetaArray, dtheta,
+                                                      values.cr, values.h)))
+                adapt = ringVelocity(yp, *(args[1:] + (thetaArray, dtheta,
+                                                       values.cr, values.h)),
+                                     induction='adaptive')
+                assert relative_err(quad[0], adapt[0]) < 1e-7
+                assert relative_err(quad[1], adapt[1]) < 1e-7
+
+    def test_tiles(self):
+        # tiles of a few dozen pairs sum to the single broadcast
+        args = (values.r, values.z, values.r[:, 1:], values.z[:, 1:],
+                values.Gamma[:, 1:], values.thetaArray, values.dtheta,
+                values.cr, values.h)
+        for induction in ('quadrature', 'elliptic', 'adaptive'):
+            whole = ringVelocity(*args, induction=induction, maxBytes=2 ** 30)
+            tiled = ringVelocity(*args, induction=induction, maxBytes=20000)
+            assert relative_err(whole[0], tiled[0]) < 1e-12
+            assert relative_err(whole[1], tiled[1]) < 1e-12
+        whole = ringInfluence(*(args[:2] + args[2:4] + args[5:]), maxBytes=2 ** 30)
+        tiled = ringInfluence(*(args[:2] + args[2:4] + args[5:]), maxBytes=20000)
+        assert np.allclose(whole[0], tiled[0], rtol=1e-12, atol=0)
+        assert np.allclose(whole[1], tiled[1], rtol=1e-12, atol=0)
+
+    def test_single(self):
+        # float32 temporaries with float64 sums stay close to float64
+        args = (values.r, values.z, values.r[:, 1:], values.z[:, 1:],
+                values.Gamma[:, 1:], values.thetaArray, values.dtheta,
+                values.cr, values.h)
+        double = ringVelocity(*args)
+        single = ringVelocity(*args, precision='single')
+        assert relative_err(double[0], single[0]) < 1e-5
+        assert relative_err(double[1], single[1]) < 1e-5
+
+        # the adaptive rule keeps float32 for the pairs on the midpoint rule
+        double = ringVelocity(*args, induction='adaptive')
+        single = ringVelocity(*args, induction='adaptive', precision='single')
+        assert relative_err(double[1], single[1]) < 1e-5
+        assert (double[1] != single[1]).any()
+
+    def test_tree(self):
+        # Barnes-Hut sum against direct summation on the stored wake
+        args = (values.r, values.z, values.r[:, 1:], values.z[:, 1:],
+                values.Gamma[:, 1:], values.thetaArray, values.dtheta,
+                values.cr, values.h)
+        direct = ringVelocity(*args)
+
+        small = treeRingVelocity(*args)
+        assert relative_err(direct[1], small[1]) < 1e-14
+
+        for openingAngle, tol in ((0.3, 1e-3), (0.6, 1e-2)):
+            tree = treeRingVelocity(*args, openingAngle=openingAngle,
+                                    leafSize=8, threshold=0)
+            assert relative_err(direct[0], tree[0]) < tol
+            assert relative_err(direct[1], tree[1]) < tol
+
+
+class Test_cylinderVelocity(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(1)
+        self.yp = rng.uniform(0, 6, 20)
+        self.zp = rng.uniform(-1, 1, 20)
+        self.r = np.array([2., 4.])
+        self.Gamma = np.array([0.3, -0.2])
+
+    def rows(self, z0, dz, zEnd):
+        """ rows of closely spaced rings standing in for the cylinders """
+        n = int(abs((zEnd - z0) / dz))
+        zr = z0 + dz * (np.arange(n) + 0.5)
+        r = np.repeat(self.r, n)
+        zr = np.tile(zr, 2)
+        Gamma = np.repeat(self.Gamma, n)
+        return r, zr, Gamma
+
+    def test_rings(self):
+        # a cylinder is the limit of a long row of rings
+        dz = 0.02
+        for z0, h, zEnd, step in ((- 2., 1e4, - 2000., - dz), (2., 1e4, 2000., dz),
+                                  (- 2., 5., - 5., - dz)):
+            r, zr, Gamma = self.rows(z0, step, zEnd)
+            rings = ringVelocity(self.yp, self.zp, r, zr, Gamma, values.thetaArray,
+                                 values.dtheta, 0.1, h, induction='elliptic')
+            cyl = cylinderVelocity(self.yp, self.zp, self.r, [z0, z0], [step, step],
+                                   self.Gamma, 0.1, h)
+            assert relative_err(rings[0], cyl[0]) < 1e-3
+            assert relative_err(rings[1], cyl[1]) < 1e-3
+
+    def test_unfrozen(self):
+        # freezing beyond the last disk leaves the wake unchanged
+        comp = vortexRing()
+        comp.yN = values.yN
+        comp.dT = values.dT
+        comp.qh = values.qh
+        comp.Nw = 4
+        comp.Kfreeze = 5
+        comp.run()
+        assert comp.rCyl.size == 0
+
+        comp.Kfreeze = 0
+        comp.run()
+        z = comp.z.copy()
+        comp.Kfreeze = 4
+        comp.run()
+        assert np.all(comp.z == z)
+
+        # the cylinders continue the oldest free disk
+        comp.Kfreeze = 2
+        comp.run()
+        assert np.all(comp.rCyl == comp.r[2, 1:])
+        assert np.all(comp.GammaCyl == comp.Gamma[2, 1:])
+
+
+class Test_marchWake(unittest.TestCase):
+
+    def setUp(self):
+        # rotation in the (r, z) plane, with a known solution
+        self.r = np.array([[1., 2.]])
+        self.z = np.array([[0., 1.]])
+        self.velocity = lambda r, z: (z, - r)
+        self.exact = (np.cos(2.) * self.r + np.sin(2.) * self.z,
+                      np.cos(2.) * self.z - np.sin(2.) * self.r)
+
+    def error(self, method, Nsteps, tol=0.):
+        r, z, vr, vz, Nvel, history = marchWake(self.velocity, self.r, self.z,
+                                                2., Nsteps, method, tol)
+        return max(np.abs(r - self.exact[0]).max(), np.abs(z - self.exact[1]).max())
+
+    def test_order(self):
+        for method, order in (('rk2', 2), ('rk4', 4), ('ab2', 2)):
+            ratio = self.error(method, 40) / self.error(method, 80)
+            assert abs(np.log2(ratio) - order) < 0.3
+
+    def test_adaptive(self):
+        for method in ('rk2', 'rk4', 'ab2'):
+            assert self.error(method, 1, 1e-6) < 1e-4
+
+    def test_euler(self):
+        comp = vortexRing()
+        comp.Nw = 3
+        comp.run()
+        assert comp.Nvel == comp.Nw * comp.Ntt
+
+
+class Test_warmStart(unittest.TestCase):
+
+    def setUp(self):
+        self.comp = vortexRing()
+        self.comp.Nw = 4
+        self.comp.run()
+        self.initial = (self.comp.Gamma.copy(), self.comp.z.copy(),
+                        self.comp.r.copy())
+
+    def test_converged(self):
+        comp = self.comp
+        comp.GammaInit, comp.zInit, comp.rInit = self.initial
+        comp.viTol = 1e3
+        comp.run()
+        assert comp.Nrev == 1
+
+        comp.viTol = 0.
+        comp.run()
+        assert comp.Nrev == comp.Nw
+
+    def test_shape(self):
+        comp = self.comp
+        comp.GammaInit, comp.zInit, comp.rInit = self.initial
+        comp.Nw = 5
+        self.assertRaises(ValueError, comp.run)
+
+
+class Test_periodic(unittest.TestCase):
+
+    def test_anderson(self):
+        # a linear map that plain fixed point iteration does not converge on
+        rng = np.random.RandomState(2)
+        A = np.diag([1.5, 0.5, -0.9, 0.2]) + 0.1 * rng.randn(4, 4)
+        b = rng.randn(4)
+        G = lambda x: np.dot(A, x) + b
+        x, Gx, residual, Niter = andersonSolve(G, np.zeros(4), 1e-10, 20)
+        assert residual < 1e-10
+        assert Niter < 20
+        assert np.abs(np.linalg.solve(np.eye(4) - A, b) - x).max() < 1e-8
+
+    def test_vortexRing(self):
+        comp = vortexRing()
+        comp.Nw = 3
+        comp.solver = 'periodic'
+        comp.run()
+        assert comp.residual < comp.periodicTol
+        assert comp.Nrev < comp.maxIter
+        assert comp.converged == 1
+        assert np.all(comp.Gamma == comp.Gamma[0])
+
+        # out of iterations the last iterate is kept and flagged
+        comp.maxIter = 2
+        comp.run()
+        assert comp.Nrev == 2
+        assert comp.residual > comp.periodicTol
+        assert comp.converged == 0
+
+        comp.solver = 'march'
+        comp.run()
+        assert comp.converged == 1
+
+
+class Test_wakeLength(unittest.TestCase):
+
+    def setUp(self):
+        self.iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'Nw', 'dtheta'):
+            setattr(self.iv, name, getattr(values, name))
+
+    def test_inducedVelocity(self):
+        self.iv.run()
+        vi = self.iv.vi
+        assert self.iv.NwUsed == values.Nw
+
+        self.iv.NwTol = 1e-12
+        self.iv.run()
+        assert self.iv.NwUsed == values.Nw
+        assert relative_err(vi, self.iv.vi) < 1e-14
+
+        self.iv.NwTol = 1e3
+        self.iv.run()
+        assert self.iv.NwUsed == 2
+
+    def test_vortexRing(self):
+        comp = vortexRing()
+        comp.Nw = 5
+        comp.NwTol = 1e3
+        comp.run()
+        assert comp.NwUsed == 2
+        assert comp.z.shape == (3, comp.Ns + 1)
+
+        # a longer Nw on inducedVelocity only sums the disks there are
+        for name in ('Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns', 'dtheta'):
+            setattr(self.iv, name, getattr(comp, name))
+        self.iv.Nw = 5
+        self.iv.run()
+        assert self.iv.NwUsed == 2
+
+
+class Test_threads(unittest.TestCase):
+
+    def test_threadedVelocity(self):
+        args = (values.r, values.z, values.r[:, 1:], values.z[:, 1:],
+                values.Gamma[:, 1:], values.thetaArray, values.dtheta,
+                values.cr, values.h)
+        direct = ringVelocity(*args, induction='elliptic')
+        pool = ThreadPool(3)
+        try:
+            threaded = threadedVelocity(pool, 3, ringVelocity, *args,
+                                        induction='elliptic', chunkBytes=10000)
+        finally:
+            pool.close()
+        assert relative_err(direct[0], threaded[0]) < 1e-14
+        assert relative_err(direct[1], threaded[1]) < 1e-14
+
+    def test_components(self):
+        comp = vortexRing()
+        comp.Nw = 3
+        comp.run()
+        z = comp.z.copy()
+        comp.threads = 2
+        comp.run()
+        assert relative_err(z, comp.z) < 1e-12
+
+        iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'Nw', 'dtheta'):
+            setattr(iv, name, getattr(values, name))
+        iv.run()
+        vi = iv.vi
+        iv.threads = 2
+        iv.run()
+        assert relative_err(vi, iv.vi) < 1e-14
+
+
+class Test_cover(unittest.TestCase):
+
+    def setUp(self):
+        self.comp = vortexRing()
+        self.comp.Nw = 3
+        self.comp.cover = 1
+        self.comp.ycmax = 4.
+
+    def test_collocation(self):
+        comp = self.comp
+        for integrator in ('euler', 'ab2'):
+            comp.integrator = integrator
+            comp.run()
+            assert comp.GammaCover.shape == (4,)
+
+            # the cover cancels the axial velocity of the wake at the covered
+            # elements
+            zp = (comp.qh[:4] + comp.qh[1:5]) / 2
+            args = (comp.thetaArray, comp.dtheta, comp.cr, comp.h)
+            vz = ringVelocity(comp.yE[:4], zp, comp.r[:3, 1:], comp.z[:3, 1:],
+                              comp.Gamma[:3, 1:], *args)[1]
+            vz += ringVelocity(comp.yE[:4], zp, comp.rCover, comp.zCover,
+                               comp.GammaCover, *args)[1]
+            assert np.abs(vz).max() < 1e-10
+
+        self.comp.solver = 'periodic'
+        self.assertRaises(ValueError, self.comp.run)
+
+    def test_factorization(self):
+        self.comp.run()
+        LU = self.comp._coverCache[1]
+        self.comp.dT = 2 * self.comp.dT
+        self.comp.run()
+        assert self.comp._coverCache[1] is LU
+
+        self.comp.ycmax = 3.
+        self.comp.run()
+        assert self.comp._coverCache[1] is not LU
+        assert self.comp.GammaCover.shape == (3,)
+
+        # the cover rings follow the precision of the wake
+        LU = self.comp._coverCache[1]
+        self.comp.precision = 'single'
+        self.comp.run()
+        assert self.comp._coverCache[1] is not LU
+
+    def test_inducedVelocity(self):
+        iv = inducedVelocity()
+        self.comp.run()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'dtheta'):
+            setattr(iv, name, getattr(self.comp, name))
+        iv.Nw = 3
+        iv.run()
+        vi = iv.vi
+
+        for name in ('rCover', 'zCover', 'GammaCover'):
+            setattr(iv, name, getattr(self.comp, name))
+        iv.run()
+        dvi = ringVelocity(iv.yE, (iv.qh[:-1] + iv.qh[1:]) / 2, iv.rCover,
+                           iv.zCover, iv.GammaCover, iv.thetaArray, iv.dtheta,
+                           iv.cr, iv.h, 0.675)[1]
+        assert relative_err(iv.vi, vi - dvi) < 1e-14
+
+
+class Test_history(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.comp = vortexRing()
+        self.comp.Nw = 3
+        self.comp.historyPath = self.path
+        self.comp.historyChunk = 4
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_euler(self):
+        comp = self.comp
+        # files of the user in the directory are left alone
+        np.save(os.path.join(self.path, 'wake_00000.npy'), np.zeros(1))
+        comp.run()
+        assert os.path.isfile(os.path.join(self.path, 'wake_00000.npy'))
+        history = WakeHistory(self.path)
+        assert len(history) == comp.Nw * comp.Ntt
+        assert len(history.chunks) == 3
+
+        T = 2 * np.pi / comp.Omega / comp.b
+        assert np.abs(history.time - np.arange(9) * T / comp.Ntt).max() < 1e-12
+        assert (history[-1]['vz'] == comp.vz).all()
+        assert (history[-1]['vr'] == comp.vr).all()
+        assert (history[0]['z'][0] == comp.qh).all()
+        assert [snapshot['t'] for snapshot in history] == list(history.time)
+        self.assertRaises(IndexError, history.__getitem__, 9)
+
+        # a new run replaces the record
+        comp.Nw = 1
+        comp.run()
+        assert len(WakeHistory(self.path)) == comp.Ntt
+
+    def test_march(self):
+        comp = self.comp
+        comp.integrator = 'rk2'
+        comp.Kfreeze = 2
+        comp.run()
+        history = WakeHistory(self.path)
+        assert len(history) == comp.Nw * comp.Ntt
+        assert (history[-1]['vz'] == comp.vz).all()
+        # the frozen disk is recorded where it stays
+        assert (history[-1]['z'][2] == history[-2]['z'][2]).all()
+
+
+class Test_wakeField(unittest.TestCase):
+
+    def test_blade(self):
+        # at the blade the field is the induced velocity
+        comp = vortexRing()
+        comp.Nw = 4
+        comp.Kfreeze = 3
+        comp.cover = 1
+        comp.ycmax = 3.
+        comp.induction = 'elliptic'
+        comp.run()
+
+        iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'Nw', 'dtheta', 'induction', 'Kfreeze', 'rCyl', 'zCyl',
+                     'dzCyl', 'GammaCyl', 'rCover', 'zCover', 'GammaCover'):
+            setattr(iv, name, getattr(comp, name))
+        iv.run()
+
+        points = np.column_stack((comp.yE, (comp.qh[:-1] + comp.qh[1:]) / 2))
+        vr, vz = wakeField(comp, points)
+        assert relative_err(iv.vi, - vz) < 1e-14
+
+        # chunks and threads do not change the field
+        points = np.random.RandomState(0).uniform(-5, 12, (200, 2))
+        vr, vz = wakeField(comp, points)
+        vrChunked, vzChunked = wakeField(comp, points, maxBytes=1, threads=2)
+        assert relative_err(vr, vrChunked) < 1e-14
+        assert relative_err(vz, vzChunked) < 1e-14
+
+
+class Test_influence(unittest.TestCase):
+
+    def setUp(self):
+        self.iv = inducedVelocity()
+        for name in ('qh', 'Gamma', 'z', 'r', 'thetaArray', 'yE', 'cr', 'Ns',
+                     'Nw', 'dtheta'):
+            setattr(self.iv, name, getattr(values, name).copy()
+                    if name in ('Gamma', 'z') else getattr(values, name))
+
+    def test_ringInfluence(self):
+        args = (values.r, values.z, values.r[:, 1:], values.z[:, 1:])
+        options = (values.thetaArray, values.dtheta, values.cr, values.h)
+        for induction in ('quadrature', 'elliptic'):
+            vr, vz = ringVelocity(*(args + (values.Gamma[:, 1:],) + options),
+                                  induction=induction)
+            Ar, Az = ringInfluence(*(args + options), induction=induction)
+            Gamma = values.Gamma[:, 1:].ravel()
+            assert relative_err(vr.ravel(), np.dot(Ar, Gamma)) < 1e-14
+            assert relative_err(vz.ravel(), np.dot(Az, Gamma)) < 1e-14
+            Ar, Az = ringInfluence(*(args + options), induction=induction,
+                                   radial=False)
+            assert Ar is None
+            assert relative_err(vz.ravel(), np.dot(Az, Gamma)) < 1e-14
+
+    def test_cache(self):
+        iv = self.iv
+        # a new geometry is summed directly
+        iv.run()
+        assert iv.dviDGamma.size == 0
+        vi = iv.vi
+
+        # the matrix is built when the geometry comes back
+        iv.run()
+        A = iv.dviDGamma
+        assert A.shape == (iv.Ns, iv.Nw * (iv.Ns + 1))
+        assert relative_err(iv.vi, vi) < 1e-12
+        assert relative_err(iv.vi, np.dot(A, iv.Gamma[:iv.Nw].ravel())) < 1e-14
+
+        # vi is linear in Gamma, and the matrix is kept
+        iv.Gamma[2, 3] += 1.
+        iv.run()
+        assert iv.dviDGamma is A
+        assert relative_err(iv.vi - vi, A[:, 2 * (iv.Ns + 1) + 3]) < 1e-12
+
+        # a new geometry drops the matrix
+        iv.z[1] -= 0.1
+        iv.run()
+        assert iv.dviDGamma.size == 0
+        iv.run()
+        assert iv.dviDGamma.size and iv.dviDGamma is not A
+
+        # buildInfluence gives the matrix on the first run of a geometry
+        iv.buildInfluence = 1
+        iv.z[1] -= 0.1
+        iv.run()
+        A = iv.dviDGamma
+        assert A.shape == (iv.Ns, iv.Nw * (iv.Ns + 1))
+        assert relative_err(iv.vi, np.dot(A, iv.Gamma[:iv.Nw].ravel())) < 1e-14
+        iv.run()
+        assert iv.dviDGamma is A
+
+        iv.evaluator = 'tree'
+        iv.run()
+        assert iv.dviDGamma.size == 0
+
+
+class Test_mergeRings(unittest.TestCase):
+
+    def test_conservation(self):
+        Gamma = values.Gamma.copy()
+        r = values.r.copy()
+        z = values.z.copy()
+        merged = mergeRings(Gamma, r, z, -0.2, 0.5)
+        assert merged.any()
+        assert (Gamma[merged] == 0).all()
+        assert (Gamma == 0).sum() - (values.Gamma == 0).sum() == merged.sum()
+        assert (Gamma[:, 0] == values.Gamma[:, 0]).all()
+
+        # circulation and its first moment are conserved
+        assert abs(Gamma.sum() - values.Gamma.sum()) < 1e-12
+        for x, x0 in ((r, values.r), (z, values.z)):
+            assert abs((Gamma * x).sum() - (values.Gamma * x0).sum()) < 1e-12
+
+        # rings above zMerge are left alone
+        above = values.z >= -0.2
+        assert (Gamma[above] == values.Gamma[above]).all()
+
+    def test_vortexRing(self):
+        comp = vortexRing()
+        comp.Nw = 6
+        comp.h = 100.
+        comp.run()
+        Gamma = comp.Gamma.copy()
+        assert comp.Nmerged == 0
+
+        comp.mergeDistance = 5.
+        comp.mergeTol = 4.
+        comp.run()
+        assert comp.Nmerged == (comp.Gamma == 0).sum() - (Gamma == 0).sum() > 0
+        assert abs(comp.Gamma[1:].sum() - Gamma[1:].sum()) < 1e-12
+
+
+class Test_prescribedWake(unittest.TestCase):
+
+    def test_geometry(self):
+        comp = vortexRing()
+        comp.Nw = 6
+        comp.run()
+        T = 2 * np.pi / comp.Omega / comp.b
+        for h in (1.5, 100.):
+            r, z = prescribedWake(comp.yN, comp.qh, comp.Gamma[0], comp.dT,
+                                  comp.rho, h, T, comp.Nw, comp.cr)
+            assert r.shape == z.shape == (comp.Nw + 1, comp.Ns + 1)
+            assert (r[0] == comp.yN).all() and (z[0] == comp.qh).all()
+            assert (z >= - h + comp.cr).all()
+        # out of ground effect the tip vortex descends and contracts
+        assert (np.diff(z[:, -1]) < 0).all()
+        assert r[-1, -1] < comp.yN[-1]
+
+
 if __name__ == "__main__":
     unittest.main()
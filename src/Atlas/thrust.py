@@ -3,6 +3,8 @@ import numpy as np
 from openmdao.main.api import Component
 from openmdao.main.datatypes.api import Int, Float, Array
 
+from lift_drag import batchCondition
+
 class Thrust(Component):
 
     #Aerocalc Inputs
@@ -12,6 +14,8 @@ class Thrust(Component):
     c = Array(iotype="in")
     rho = Float(iotype="in")
     Omega = Float(iotype="in")
+    rhoBatch = Array(np.zeros(0), iotype="in", desc="air densities, one per condition (empty - rho)")
+    OmegaBatch = Array(np.zeros(0), iotype="in", desc="rotor speeds, one per condition (empty - Omega); with either batch dT has a row per condition")
 
     #Aerocalc intermediate values
     Ns = Int(iotype="in")
@@ -21,8 +25,10 @@ class Thrust(Component):
     chordFrac = Array(iotype="out")
 
     def execute(self):
+        rho = batchCondition(self.rho, self.rhoBatch)
+        Omega = batchCondition(self.Omega, self.OmegaBatch)
         self.chordFrac = np.ones(self.Ns)
-        self.dT = np.zeros(self.Ns)
+        self.dT = np.zeros(np.broadcast(rho, Omega, self.chordFrac).shape)
 
         for index, element in enumerate(self.yN):
             if element < self.ycmax:
@@ -34,8 +40,8 @@ class Thrust(Component):
 
         self.dT += self.chordFrac
         self.dT *= 0.5 
-        self.dT *= self.rho
-        self.dT *= (self.Omega * self.r) ** 2
+        self.dT *= rho
+        self.dT *= (Omega * self.r) ** 2
         self.dT *= self.Cl 
         self.dT *= self.c
         self.dT *= self.dr
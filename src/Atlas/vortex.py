@@ -1,7 +1,915 @@
 from openmdao.main.api import Component
-from openmdao.lib.datatypes.api import Float, Array, Int
+from openmdao.lib.datatypes.api import Float, Array, Int, Enum, Str
+import logging
+import os
 import numpy as np
+from numpy.lib.format import open_memmap
 from numpy import pi, cos, sin, mean, linspace, sqrt
+from scipy.special import ellipkm1, ellipe
+from scipy.linalg import lu_factor, lu_solve
+from multiprocessing.pool import ThreadPool
+
+# convergence warnings of the periodic wake solver
+_logger = logging.getLogger(__name__)
+
+
+def ringVelocity(yp, zp, r, zr, Gamma, thetaArray, dtheta, cr, h, ringFrac=1.0,
+                 induction='quadrature', precision='double', maxBytes=2 ** 22):
+    """
+    Velocity induced at the points (yp, zp) by a set of vortex rings and their
+    ground images.
+
+    The rings have radius r, height zr and circulation Gamma (scaled by
+    ringFrac), and each ring's ground image sits at -2h - zr with opposite
+    circulation. With induction='quadrature' the Biot-Savart integral around
+    each ring is evaluated with the midpoint rule on thetaArray, with the
+    distance to each ring element clamped to the core radius cr. With
+    induction='elliptic' it is evaluated in closed form from the complete
+    elliptic integrals K(m) and E(m). With induction='adaptive' pairs away
+    from the core get a Gauss-Legendre rule with as few points as keep each
+    ring's integrals to a relative error of 1e-8. The target x ring terms
+    are evaluated as broadcast arrays in tiles of about maxBytes of
+    temporaries. With precision='single' the (target, ring, theta)
+    quadrature temporaries are float32, summed in float64; with
+    induction='adaptive' this applies to the pairs left on the midpoint
+    rule, and the closed form has no such temporaries.
+
+    Returns (vr, vz), each with the shape of yp.
+    """
+    yp = np.asarray(yp, dtype=float)
+    shape = yp.shape
+    yp = yp.reshape(-1, 1)
+    zp = np.asarray(zp, dtype=float).reshape(-1, 1)
+    r = np.asarray(r, dtype=float).ravel()
+    zr = np.asarray(zr, dtype=float).ravel()
+    M = (np.asarray(Gamma, dtype=float) * ringFrac).ravel() * r / (2 * pi)
+    integrals = _ringIntegrals(induction, precision)
+
+    vr = np.zeros(yp.shape[0])
+    vz = np.zeros(yp.shape[0])
+    for t, k in _tiles(yp.shape[0], r.size, induction, thetaArray, maxBytes):
+        for sign, zRing in ((1, zr[k]), (-1, - 2 * h - zr[k])):
+            dz = zp[t] - zRing
+            Icos, I1 = integrals(yp[t], r[k], dz, thetaArray, dtheta, cr)
+            vr[t] += sign * np.dot(- Icos * dz, M[k])
+            vz[t] += sign * np.dot(Icos * yp[t] - I1 * r[k], M[k])
+
+    return vr.reshape(shape), vz.reshape(shape)
+
+
+def ringInfluence(yp, zp, r, zr, thetaArray, dtheta, cr, h,
+                  induction='quadrature', precision='double', maxBytes=2 ** 22,
+                  radial=True):
+    """
+    Influence matrices of ringVelocity: the velocity (Ar, Az) induced at the
+    points (yp, zp) by each ring of unit circulation and its ground image,
+    so that ringVelocity returns (Ar Gamma, Az Gamma). With radial=False
+    only Az is formed.
+
+    Returns (Ar, Az), each (number of points, number of rings), with Ar None
+    if radial is False.
+    """
+    yp = np.asarray(yp, dtype=float).reshape(-1, 1)
+    zp = np.asarray(zp, dtype=float).reshape(-1, 1)
+    r = np.asarray(r, dtype=float).ravel()
+    zr = np.asarray(zr, dtype=float).ravel()
+    integrals = _ringIntegrals(induction, precision)
+
+    Ar = np.zeros((yp.shape[0], r.size)) if radial else None
+    Az = np.zeros((yp.shape[0], r.size))
+    for t, k in _tiles(yp.shape[0], r.size, induction, thetaArray, maxBytes):
+        for sign, zRing in ((1, zr[k]), (-1, - 2 * h - zr[k])):
+            dz = zp[t] - zRing
+            Icos, I1 = integrals(yp[t], r[k], dz, thetaArray, dtheta, cr)
+            if radial:
+                Ar[t, k] -= sign * Icos * dz
+            Az[t, k] += sign * (Icos * yp[t] - I1 * r[k])
+
+    Az *= r / (2 * pi)
+    if radial:
+        Ar *= r / (2 * pi)
+    return Ar, Az
+
+
+def _pairBytes(induction, thetaArray):
+    """ approximate bytes of kernel temporaries per (target, ring) pair """
+    # the quadrature keeps about three (target, ring, theta) arrays, the
+    # closed form about 16 (target, ring) arrays
+    return 8 * (16 if induction == 'elliptic' else 3 * len(thetaArray))
+
+
+def _tiles(Ntargets, Nrings, induction, thetaArray, maxBytes):
+    """
+    (target, ring) slices of the tiles of a kernel evaluation, with about
+    maxBytes of temporaries each: whole rows of rings while they fit.
+    """
+    pairs = max(1, maxBytes // _pairBytes(induction, thetaArray))
+    ringSize = max(1, min(Nrings, pairs))
+    targetSize = max(1, pairs // ringSize)
+    for t in range(0, Ntargets, targetSize):
+        for k in range(0, Nrings, ringSize):
+            yield slice(t, t + targetSize), slice(k, k + ringSize)
+
+
+def _ringIntegrals(induction, precision):
+    """ the theta integrals of a ring for an induction model and precision """
+    if induction == 'elliptic':
+        return _ellipticIntegrals
+    elif induction == 'adaptive':
+        if precision == 'single':
+            def integrals(yp, r, dz, thetaArray, dtheta, cr):
+                return _adaptiveIntegrals(yp, r, dz, thetaArray, dtheta, cr,
+                                          midpoint=_singleThetaIntegrals)
+            return integrals
+        return _adaptiveIntegrals
+    elif precision == 'single':
+        return _singleThetaIntegrals
+    return _thetaIntegrals
+
+
+def _thetaIntegrals(yp, r, dz, thetaArray, dtheta, cr):
+    """
+    Midpoint-rule integrals over theta of cos(theta)/|R|^3 and 1/|R|^3 for a
+    point at (yp, dz) relative to a ring of radius r, with |R| clamped to cr.
+    yp, r and dz are broadcast together; theta is added as a trailing axis.
+    """
+    cosTheta = cos(thetaArray)
+    sinTheta = sin(thetaArray)
+    r = r[..., np.newaxis]
+
+    Norm2 = (yp[..., np.newaxis] - r * cosTheta) ** 2
+    Norm2 += (r * sinTheta) ** 2
+    Norm2 += (dz ** 2)[..., np.newaxis]
+    np.maximum(Norm2, cr ** 2, out=Norm2)
+    invNorm3 = np.sqrt(Norm2)
+    invNorm3 *= Norm2
+    np.reciprocal(invNorm3, invNorm3)
+
+    return np.dot(invNorm3, cosTheta) * dtheta, invNorm3.sum(axis=-1) * dtheta
+
+
+def _singleThetaIntegrals(yp, r, dz, thetaArray, dtheta, cr):
+    """
+    _thetaIntegrals with float32 temporaries. The geometry is formed in
+    float64 and rounded once; the sums over theta are accumulated in float64.
+    """
+    single = np.float32
+    cosTheta = cos(thetaArray).astype(single)
+    sinTheta = sin(thetaArray).astype(single)
+    r = r.astype(single)[..., np.newaxis]
+
+    Norm2 = (yp.astype(single)[..., np.newaxis] - r * cosTheta) ** 2
+    Norm2 += (r * sinTheta) ** 2
+    Norm2 += (dz ** 2).astype(single)[..., np.newaxis]
+    np.maximum(Norm2, single(cr ** 2), out=Norm2)
+    invNorm3 = np.sqrt(Norm2)
+    invNorm3 *= Norm2
+    np.reciprocal(invNorm3, invNorm3)
+
+    I1 = invNorm3.sum(axis=-1, dtype=float) * dtheta
+    invNorm3 *= cosTheta
+    return invNorm3.sum(axis=-1, dtype=float) * dtheta, I1
+
+
+def _adaptiveIntegrals(yp, r, dz, thetaArray, dtheta, cr, tol=1e-8,
+                       midpoint=_thetaIntegrals):
+    """
+    _thetaIntegrals with the rule chosen per pair. Outside the core radius the
+    integrands are analytic in theta, with poles at theta = +-i s where
+    cosh(s) = a / b (a, b as in _ellipticIntegrals), so n-point
+    Gauss-Legendre on [0, pi] converges as rho^(-2n), rho the Bernstein
+    ellipse through the pole. Pairs are grouped by the number of
+    Gauss-Legendre points, in halvings of len(thetaArray), that reaches a
+    relative error tol; pairs inside the core radius or that need as many
+    points keep the midpoint rule on thetaArray, evaluated by midpoint.
+    """
+    yp, r, dz = np.broadcast_arrays(yp, r, dz)
+    a = yp ** 2 + r ** 2 + dz ** 2
+    b = 2 * yp * r
+    core = (np.abs(yp) - np.abs(r)) ** 2 + dz ** 2 < cr ** 2
+
+    Icos = np.empty(yp.shape)
+    I1 = np.empty(yp.shape)
+    todo = ~core
+    sizes = []
+    n = thetaArray.size // 2
+    while n >= 3:
+        sizes.insert(0, n)
+        n //= 2
+    for n in sizes:
+        # the smallest a / b for which n points reach tol: the Bernstein
+        # ellipse rho = (10 / tol)^(1 / 2n) passes through the pole at
+        # theta = i s, mapped to -1 + 2i s / pi on [-1, 1]
+        rho = (10 / tol) ** (0.5 / n)
+        c = (rho + 1 / rho) / 2
+        pairs = todo & (a >= np.cosh(pi / 2 * (c * c - 1) / c) * np.abs(b))
+        if pairs.any():
+            x, w = np.polynomial.legendre.leggauss(n)
+            Icos[pairs], I1[pairs] = _gaussIntegrals(a[pairs], b[pairs],
+                                                     pi / 2 * (x + 1), pi / 2 * w)
+            todo &= ~pairs
+    todo |= core
+    if todo.any():
+        Icos[todo], I1[todo] = midpoint(yp[todo], r[todo], dz[todo],
+                                        thetaArray, dtheta, cr)
+    return Icos, I1
+
+
+def _gaussIntegrals(a, b, theta, weights):
+    """
+    theta integrals of _thetaIntegrals by a weighted rule, with no core, for
+    |R|^2 = a - b cos(theta)
+    """
+    cosTheta = cos(theta)
+    Norm2 = a[..., np.newaxis] - b[..., np.newaxis] * cosTheta
+    invNorm3 = np.sqrt(Norm2)
+    invNorm3 *= Norm2
+    np.reciprocal(invNorm3, invNorm3)
+    return np.dot(invNorm3, cosTheta * weights), np.dot(invNorm3, weights)
+
+
+def _ellipticIntegrals(yp, r, dz, thetaArray, dtheta, cr):
+    """
+    Closed-form counterpart of _thetaIntegrals.
+
+    With |R|^2 = a - b cos(theta), a = yp^2 + r^2 + dz^2, b = 2 yp r and
+    m = 2b / (a + b):
+        int 1/|R|^3          = 2 E(m) / ((a - b) sqrt(a + b))
+        int cos(theta)/|R|^3 = 2 (a E(m) / (a - b) - K(m)) / (b sqrt(a + b))
+    Pairs whose closest approach, sqrt(a - |b|), is inside the core radius
+    are evaluated with the clamped quadrature instead, so the core model
+    matches the quadrature path.
+    """
+    yp, r, dz = np.broadcast_arrays(yp, r, dz)
+    a = yp ** 2 + r ** 2 + dz ** 2
+    b = 2 * yp * r
+    amb = (yp - r) ** 2 + dz ** 2
+    # a target at negative radius is closest to the ring at theta = pi
+    near = (np.abs(yp) - np.abs(r)) ** 2 + dz ** 2 < cr ** 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        apb = a + b
+        m1 = amb / apb    # complementary parameter 1 - m, exact near m = 1
+        E = ellipe(1 - m1)
+        K = ellipkm1(m1)
+        sqrtApb = sqrt(apb)
+        I1 = 2 * E / (amb * sqrtApb)
+        Icos = 2 * (a * E / amb - K) / (b * sqrtApb)
+
+        # the closed form for Icos cancels badly as b/a -> 0 (points near the
+        # axis), where the series in x = b/a is accurate to O(x^5)
+        x = b / a
+        small = np.abs(x) < 1e-3
+        if small.any():
+            x = x[small]
+            Icos[small] = (0.75 * pi * x + 105 * pi / 128 * x ** 3) / a[small] ** 1.5
+
+    if near.any():
+        Icos[near], I1[near] = _thetaIntegrals(yp[near], r[near], dz[near],
+                                               thetaArray, dtheta, cr)
+
+    return Icos, I1
+
+
+def cylinderVelocity(yp, zp, r, z0, dz, Gamma, cr, h, ringFrac=1.0):
+    """
+    Velocity induced at the points (yp, zp) by semi-infinite vortex cylinders
+    and their ground images.
+
+    Each cylinder closes a row of rings of radius r and circulation Gamma
+    (scaled by ringFrac) spaced dz apart: it starts at z0 and extends in the
+    direction of dz with circulation Gamma/|dz| per unit length, to infinity
+    or, if it heads for the ground, to the ground plane at z = -h. The
+    velocity follows in closed form from the complete elliptic integrals K, E
+    and Pi, with the distance to the cylinder edge clamped to the core
+    radius cr.
+
+    Returns (vr, vz), each with the shape of yp.
+    """
+    yp = np.asarray(yp, dtype=float)
+    shape = yp.shape
+    # the field is symmetric about the axis
+    side = np.where(yp < 0, -1., 1.).ravel()
+    yp = np.abs(yp).reshape(-1, 1)
+    zp = np.asarray(zp, dtype=float).reshape(-1, 1)
+    r = np.abs(np.asarray(r, dtype=float)).ravel()
+    z0 = np.asarray(z0, dtype=float).ravel()
+    dz = np.asarray(dz, dtype=float).ravel()
+    gamma = (np.asarray(Gamma, dtype=float) * ringFrac).ravel() / np.abs(dz)
+    e = np.where(dz < 0, -1., 1.)
+
+    # a cylinder heading for the ground is the difference of two
+    # semi-infinite cylinders, starting at z0 and at the ground plane; all
+    # cylinders and their images are evaluated in one go
+    grounded = e < 0
+    z0 = np.where(grounded, np.maximum(z0, - h), z0)
+    ground = - h * np.ones(grounded.sum())
+    zStart = np.concatenate((z0, - 2 * h - z0, ground, ground))
+    direction = np.concatenate((e, - e, e[grounded], - e[grounded]))
+    weight = np.concatenate((gamma, - gamma, - gamma[grounded], gamma[grounded]))
+    r = np.concatenate((r, r, r[grounded], r[grounded]))
+
+    ur, uz = _semiInfiniteCylinder(yp, zp, r, zStart, direction, cr)
+    vr = side * np.dot(ur, weight)
+    vz = np.dot(uz, weight)
+
+    return vr.reshape(shape), vz.reshape(shape)
+
+
+def _semiInfiniteCylinder(yp, zp, r, zStart, direction, cr):
+    """
+    Velocity per unit circulation density induced at (yp, zp) by the
+    semi-infinite cylinders of rings at zStart + direction * s, s >= 0.
+    Returns (ur, uz), each (targets, cylinders).
+    """
+    # the field of the direction = -1 cylinder is the mirror image of the
+    # direction = 1 one
+    zeta = direction * (zp - zStart)
+    apb = (r + yp) ** 2 + zeta ** 2
+    m1 = np.minimum(np.maximum((r - yp) ** 2 + zeta ** 2, cr ** 2) / apb, 1)
+    m = 1 - m1
+    K = ellipkm1(m1)
+    E = ellipe(m)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # axial velocity; the Pi term drops out on the cylinder radius
+        n = 4 * r * yp / (r + yp) ** 2
+        ratio = (r - yp) / (r + yp)
+        onSheet = ratio == 0
+        Pi = _ellipticPi(n, m1, np.where(onSheet, 1., np.abs(ratio)))
+        Pi[onSheet] = 0
+        inside = np.where(yp < r, 1., np.where(yp > r, 0., 0.5))
+        uz = - 0.5 * (inside + zeta / (pi * sqrt(apb)) * (K + ratio * Pi))
+
+        # radial velocity; ((2 - m) K - 2 E) / k cancels as m -> 0
+        bracket = ((2 - m) * K - 2 * E) / sqrt(m)
+        small = m < 1e-4
+        bracket[small] = pi / 16 * m[small] ** 1.5 * (1 + 0.75 * m[small])
+        ur = np.where(yp <= 0, 0., sqrt(r / yp) * bracket / (2 * pi))
+
+    return direction * ur, uz
+
+
+def _ellipticPi(n, m1, p):
+    """
+    Complete elliptic integral of the third kind Pi(n, m) for 1 - m = m1 and
+    m <= n < 1, where p = sqrt(1 - n), by the arithmetic-geometric mean
+    (DLMF 19.8.6).
+    """
+    a = np.ones(np.broadcast(n, m1, p).shape)
+    g = sqrt(m1) * a
+    p0 = p * a
+    p = p0
+    Q = np.ones(a.shape)
+    total = Q.copy()
+    while True:
+        ag = a * g
+        Q *= 0.5 * (p * p - ag) / (p * p + ag)
+        total += Q
+        p = (p * p + ag) / (2 * p)
+        a, g = 0.5 * (a + g), sqrt(ag)
+        # (NaN entries count as converged)
+        if not ((np.abs(Q) >= 1e-16).any() or (np.abs(a - g) >= 1e-15).any()):
+            break
+    return pi / (4 * a) * (2 + n / (p0 * p0) * total)
+
+
+def treeRingVelocity(yp, zp, r, zr, Gamma, thetaArray, dtheta, cr, h,
+                     ringFrac=1.0, induction='quadrature', openingAngle=0.5,
+                     leafSize=32, threshold=2000, precision='double',
+                     maxBytes=2 ** 22):
+    """
+    Barnes-Hut counterpart of ringVelocity for large wakes.
+
+    Rings and target points are sorted into kd-trees in the meridional
+    (r, z) plane. A cell of rings whose diagonal is less than openingAngle
+    times its distance to a leaf of targets (and to the ground image of the
+    cell) is replaced by two equivalent rings, one per sign of circulation,
+    at the circulation-weighted centroid of that sign. This conserves the
+    total circulation and first moment of the cell, so the error is second
+    order in openingAngle. Everything closer is summed directly. With fewer
+    than threshold rings the direct ringVelocity is used, and direct sums
+    are tiled to about maxBytes of temporaries.
+
+    Returns (vr, vz), each with the shape of yp.
+    """
+    yp = np.asarray(yp, dtype=float)
+    shape = yp.shape
+    yp = yp.ravel()
+    zp = np.asarray(zp, dtype=float).ravel()
+    r = np.asarray(r, dtype=float).ravel()
+    zr = np.asarray(zr, dtype=float).ravel()
+    Gamma = (np.asarray(Gamma, dtype=float) * ringFrac).ravel()
+
+    if r.size < threshold:
+        vr, vz = ringVelocity(yp, zp, r, zr, Gamma, thetaArray, dtheta, cr, h,
+                              induction=induction, precision=precision,
+                              maxBytes=maxBytes)
+        return vr.reshape(shape), vz.reshape(shape)
+
+    sources = _ringTree(np.column_stack((r, zr)), leafSize, Gamma)
+    targets = _ringTree(np.column_stack((yp, zp)), leafSize)
+
+    vr = np.zeros(yp.size)
+    vz = np.zeros(yp.size)
+    for leaf in targets.leaves:
+        lo, hi = targets.lo[leaf], targets.hi[leaf]
+
+        # interaction list: far cells as equivalent rings, near leaves directly
+        far = []
+        near = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            dist = min(_boxDistance(lo, hi, sources.lo[node], sources.hi[node]),
+                       _boxDistance(lo, hi, sources.imageLo(node, h),
+                                    sources.imageHi(node, h)))
+            if sources.size[node] < openingAngle * dist:
+                far.append(node)
+            elif sources.children[node] is None:
+                near.append(node)
+            else:
+                stack.extend(sources.children[node])
+
+        near = np.concatenate([sources.index[node] for node in near] or
+                              [np.zeros(0, dtype=int)])
+        far = np.array(far, dtype=int)
+        ringR = np.concatenate((r[near], sources.equivalent[far, :, 0].ravel()))
+        ringZ = np.concatenate((zr[near], sources.equivalent[far, :, 1].ravel()))
+        ringGamma = np.concatenate((Gamma[near], sources.equivalent[far, :, 2].ravel()))
+
+        index = targets.index[leaf]
+        vr[index], vz[index] = ringVelocity(yp[index], zp[index], ringR, ringZ,
+                                            ringGamma, thetaArray, dtheta, cr, h,
+                                            induction=induction,
+                                            precision=precision,
+                                            maxBytes=maxBytes)
+
+    return vr.reshape(shape), vz.reshape(shape)
+
+
+class _ringTree(object):
+    """
+    kd-tree over points in the (r, z) plane, split at the median of the
+    longer side of each cell. Nodes are numbered depth first from the root
+    (node 0). When Gamma is given, each node also carries its equivalent
+    rings: equivalent[node, sign] = (r, z, Gamma) for the positive and
+    negative circulation in the node.
+    """
+
+    def __init__(self, points, leafSize, Gamma=None):
+        self.points = points
+        self.leafSize = leafSize
+        self.lo = []
+        self.hi = []
+        self.size = []
+        self.index = []
+        self.children = []
+        self.leaves = []
+        self._build(np.arange(points.shape[0]))
+        self.lo = np.array(self.lo)
+        self.hi = np.array(self.hi)
+        self.size = np.array(self.size)
+
+        if Gamma is not None:
+            self.equivalent = np.zeros((len(self.index), 2, 3))
+            for node, index in enumerate(self.index):
+                for sign, part in enumerate((Gamma[index] > 0, Gamma[index] < 0)):
+                    G = Gamma[index][part]
+                    if G.size:
+                        total = G.sum()
+                        self.equivalent[node, sign, :2] = \
+                            np.dot(G, points[index][part]) / total
+                        self.equivalent[node, sign, 2] = total
+
+    def _build(self, index):
+        node = len(self.index)
+        points = self.points[index]
+        lo = points.min(axis=0)
+        hi = points.max(axis=0)
+        self.lo.append(lo)
+        self.hi.append(hi)
+        self.size.append(sqrt(np.sum((hi - lo) ** 2)))
+        self.index.append(index)
+        self.children.append(None)
+
+        if index.size <= self.leafSize:
+            self.leaves.append(node)
+            return node
+
+        axis = np.argmax(hi - lo)
+        order = np.argsort(points[:, axis], kind='mergesort')
+        half = index.size // 2
+        self.children[node] = (self._build(index[order[:half]]),
+                               self._build(index[order[half:]]))
+        return node
+
+    def imageLo(self, node, h):
+        return np.array([self.lo[node, 0], - 2 * h - self.hi[node, 1]])
+
+    def imageHi(self, node, h):
+        return np.array([self.hi[node, 0], - 2 * h - self.lo[node, 1]])
+
+
+def _boxDistance(lo1, hi1, lo2, hi2):
+    """ distance between two axis-aligned boxes (zero if they overlap) """
+    gap = np.maximum(0, np.maximum(lo1 - hi2, lo2 - hi1))
+    return sqrt(np.sum(gap ** 2))
+
+
+def threadedVelocity(pool, threads, kernel, yp, zp, r, zr, Gamma, thetaArray,
+                     *args, **kwargs):
+    """
+    kernel(yp, zp, r, zr, Gamma, thetaArray, *args, **kwargs) -> (vr, vz)
+    with the target points split into chunks evaluated on pool, a
+    multiprocessing ThreadPool of threads threads. Chunks hold about
+    chunkBytes of kernel temporaries (as estimated by _pairBytes), and there
+    are at least as many as there are threads. NumPy releases the GIL in its
+    array loops, so chunks run concurrently.
+
+    Returns (vr, vz), each with the shape of yp.
+    """
+    chunkBytes = kwargs.pop('chunkBytes', 2 ** 20)
+    yp = np.asarray(yp, dtype=float)
+    shape = yp.shape
+    yp = yp.ravel()
+    zp = np.asarray(zp, dtype=float).ravel()
+    width = np.size(r) * _pairBytes(kwargs.get('induction'), thetaArray)
+    size = max(1, min(chunkBytes // width, -(-yp.size // threads)))
+    starts = range(0, yp.size, size)
+
+    def chunk(start):
+        return kernel(yp[start:start + size], zp[start:start + size], r, zr,
+                      Gamma, thetaArray, *args, **kwargs)
+
+    vr, vz = zip(*pool.map(chunk, starts))
+    return np.concatenate(vr).reshape(shape), np.concatenate(vz).reshape(shape)
+
+
+def wakeField(wake, points, maxBytes=2 ** 22, threads=1):
+    """
+    Velocity induced at off-body points by a solved wake, e.g. a vortexRing
+    after it has run: the disks, far-wake cylinders and cover that
+    inducedVelocity sums at the blade, with its first disk weighting. points
+    is an N x 2 array of (r, z). The points are evaluated in chunks whose
+    temporaries take about maxBytes, on threads threads.
+
+    Returns (vr, vz), each of length N.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    Nw = wake.Gamma.shape[0] - 1
+    if wake.rCyl.size:
+        Nw = min(Nw, wake.Kfreeze)
+    ringFrac = np.ones((Nw, 1))
+    ringFrac[0] = 0.675
+    r = np.concatenate((wake.r[:Nw, 1:].ravel(), wake.rCover))
+    zr = np.concatenate((wake.z[:Nw, 1:].ravel(), wake.zCover))
+    Gamma = np.concatenate(((wake.Gamma[:Nw, 1:] * ringFrac).ravel(),
+                            0.675 * wake.GammaCover))
+
+    if wake.evaluator == 'tree':
+        kernel = treeRingVelocity
+        options = dict(openingAngle=wake.openingAngle,
+                       threshold=wake.treeThreshold)
+    else:
+        kernel = ringVelocity
+        options = {}
+
+    # approximate bytes of temporaries per point: those of the ring kernel,
+    # and 24 (cylinder and image) arrays for the cylinders
+    width = (r.size * _pairBytes(wake.induction, wake.thetaArray) +
+             8 * 4 * wake.rCyl.size * 24)
+    size = max(1, maxBytes // max(width, 1))
+    vr = np.zeros(points.shape[0])
+    vz = np.zeros(points.shape[0])
+
+    def chunk(start):
+        yp = points[start:start + size, 0]
+        zp = points[start:start + size, 1]
+        vr[start:start + size], vz[start:start + size] = kernel(
+            yp, zp, r, zr, Gamma, wake.thetaArray, wake.dtheta, wake.cr,
+            wake.h, induction=wake.induction, precision=wake.precision,
+            maxBytes=maxBytes, **options)
+        if wake.rCyl.size:
+            vrCyl, vzCyl = cylinderVelocity(yp, zp, wake.rCyl, wake.zCyl,
+                                            wake.dzCyl, wake.GammaCyl,
+                                            wake.cr, wake.h)
+            vr[start:start + size] += vrCyl
+            vz[start:start + size] += vzCyl
+
+    starts = range(0, points.shape[0], size)
+    if threads > 1:
+        pool = ThreadPool(threads)
+        try:
+            pool.map(chunk, starts)
+        finally:
+            pool.close()
+    else:
+        for start in starts:
+            chunk(start)
+    return vr, vz
+
+
+def marchWake(velocity, r, z, T, Nsteps, method='rk4', tol=0., history=None,
+              observer=None):
+    """
+    Convect rings at (r, z) with velocity(r, z) -> (vr, vz) over a time T.
+
+    method is 'rk2' (Heun, with an embedded Euler error estimate), 'rk4'
+    (classic Runge-Kutta, with Zonneveld's embedded third order estimate,
+    reusing the velocity at the end of a step for the next) or 'ab2'
+    (variable-step Adams-Bashforth, with the difference to Euler as error
+    estimate). With tol = 0 the Nsteps equal steps are taken. Otherwise the
+    steps start at T / Nsteps and are adapted to keep the estimated local
+    error of the ring positions below tol [m].
+
+    history carries the last velocity and step of 'ab2' from one call to the
+    next, as returned by the previous call. Rings whose rows in it are NaN
+    (new rings) start with an Euler step; without history 'ab2' starts with
+    a Heun step.
+
+    observer(time, r, z, vr, vz), if given, is called with the state at the
+    start of every accepted step.
+
+    Returns (r, z, vr, vz, Nvel, history), where vr, vz is the velocity at
+    the start of the last step and Nvel the number of velocity evaluations.
+    """
+    order = {'rk2': 1, 'rk4': 3, 'ab2': 1}[method]
+    y = np.array((r, z), dtype=float)
+    f = np.array(velocity(*y))
+    Nvel = 1
+    fPrev, dtPrev = history or (None, 1.)
+    if fPrev is not None:
+        fPrev = np.where(np.isnan(fPrev), f, fPrev)
+
+    time = 0.
+    dt = T / Nsteps
+    while time < T * (1 - 1e-12):
+        dt = min(dt, T - time)
+        if method == 'rk2':
+            k2 = np.array(velocity(*(y + dt * f)))
+            yNew = y + dt / 2 * (f + k2)
+            error = dt / 2 * np.abs(k2 - f).max()
+            fNew = None
+            Nvel += 1
+        elif method == 'rk4':
+            k2 = np.array(velocity(*(y + dt / 2 * f)))
+            k3 = np.array(velocity(*(y + dt / 2 * k2)))
+            k4 = np.array(velocity(*(y + dt * k3)))
+            yNew = y + dt / 6 * (f + 2 * k2 + 2 * k3 + k4)
+            fNew = np.array(velocity(*yNew))
+            error = dt / 6 * np.abs(k4 - fNew).max()
+            Nvel += 4
+        elif fPrev is None:
+            # no history yet: start with a Heun step
+            k2 = np.array(velocity(*(y + dt * f)))
+            yNew = y + dt / 2 * (f + k2)
+            error = dt / 2 * np.abs(k2 - f).max()
+            fNew = None
+            Nvel += 1
+        else:
+            w = dt / dtPrev
+            yNew = y + dt * ((1 + w / 2) * f - w / 2 * fPrev)
+            error = dt * w / 2 * np.abs(f - fPrev).max()
+            fNew = None
+
+        if tol > 0 and error > tol:
+            dt *= max(0.2, 0.9 * (tol / error) ** (1. / (order + 1)))
+            continue
+
+        if observer:
+            observer(time, y[0], y[1], f[0], f[1])
+        time += dt
+        y = yNew
+        vr, vz = f
+        fPrev, dtPrev = f, dt
+        if time < T * (1 - 1e-12):
+            if fNew is None:
+                fNew = np.array(velocity(*y))
+                Nvel += 1
+            f = fNew
+        if tol > 0:
+            dt *= min(2., 0.9 * (tol / max(error, 1e-300)) ** (1. / (order + 1)))
+
+    return y[0], y[1], vr, vz, Nvel, (fPrev, dtPrev)
+
+
+def mergeRings(Gamma, r, z, zMerge, tol):
+    """
+    Amalgamate rings (columns 1 on of the disks in the rows of Gamma, r and
+    z, in place) below the height zMerge: neighbouring rings within a disk
+    or across disks with circulation of the same sign and less than tol
+    apart are merged into one at their circulation-weighted centroid, which
+    conserves the total circulation and its first moment. The ring merged
+    away keeps its position, with no circulation.
+
+    Returns a boolean array flagging the rings merged away.
+    """
+    below = z < zMerge
+    below[:, 0] = False
+    candidates = []
+    for j, k in ((0, 1), (1, 0)):
+        # neighbours one column (within a disk) or one row (across disks) on
+        a = (slice(0, Gamma.shape[0] - j), slice(0, Gamma.shape[1] - k))
+        b = (slice(j, None), slice(k, None))
+        close = below[a] & below[b] & \
+            ((r[a] - r[b]) ** 2 + (z[a] - z[b]) ** 2 < tol ** 2)
+        for i, s in zip(*np.nonzero(close)):
+            candidates.append((i, s, i + j, s + k))
+
+    merged = np.zeros(Gamma.shape, dtype=bool)
+    for i, s, j, k in sorted(candidates):
+        Ga = Gamma[i, s]
+        Gb = Gamma[j, k]
+        if Ga * Gb > 0:
+            r[i, s] = (Ga * r[i, s] + Gb * r[j, k]) / (Ga + Gb)
+            z[i, s] = (Ga * z[i, s] + Gb * z[j, k]) / (Ga + Gb)
+            Gamma[i, s] = Ga + Gb
+            Gamma[j, k] = 0.
+            merged[j, k] = True
+    return merged
+
+
+def prescribedWake(yN, qh, Gamma, dT, rho, h, T, Nw, cr, substeps=8):
+    """
+    Prescribed hover wake of Nw disks of rings of circulation Gamma, shed
+    every T from the rotor nodes (yN, qh) h above the ground, for an initial
+    wake geometry.
+
+    The wake is taken as the semi-infinite vortex cylinders of
+    cylinderVelocity, one per node from the rotor down, with the disks a
+    momentum theory induced velocity vh = sqrt(thrust / (2 rho A)) times T
+    apart. They end at the ground and have ground images, so their velocity
+    slows towards the ground and turns outwards. The rings of the disks are
+    convected through that fixed field with substeps Runge-Kutta steps per
+    T, and kept cr above the ground.
+
+    It can be passed to vortexRing as rInit and zInit, but marching all Nw
+    disks from it costs more than marching from the rotor.
+
+    Returns (r, z), each (Nw + 1) x len(yN), with the rotor in row 0.
+    """
+    R = yN[-1]
+    vh = sqrt(np.sum(dT) / (2 * rho * pi * R ** 2))
+    dz = - vh * T * np.ones(yN.size - 1)
+
+    def velocity(y):
+        return np.array(cylinderVelocity(y[0], y[1], yN[1:], qh[1:], dz,
+                                         Gamma[1:], cr, h))
+
+    wake = np.zeros((Nw + 1, 2, yN.size))
+    wake[0] = yN, qh
+    y = wake[0].copy()
+    dt = T / substeps
+    for k in range(1, Nw + 1):
+        for step in range(substeps):
+            k1 = velocity(y)
+            k2 = velocity(y + dt / 2 * k1)
+            k3 = velocity(y + dt / 2 * k2)
+            k4 = velocity(y + dt * k3)
+            y += dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            y[1] = np.maximum(y[1], - h + cr)
+        wake[k] = y
+    return wake[:, 0], wake[:, 1]
+
+
+def andersonSolve(G, x, tol, maxIter=50, depth=5):
+    """
+    Solve the fixed point problem x = G(x) by Anderson acceleration, mixing
+    the last depth iterates. Stops when the residual max |G(x) - x| is below
+    tol or after maxIter evaluations of G.
+
+    Returns (x, G(x), residual, number of evaluations of G).
+    """
+    X = []
+    F = []
+    for k in range(1, maxIter + 1):
+        Gx = G(x)
+        f = Gx - x
+        residual = np.abs(f).max()
+        if not residual >= tol or k == maxIter:
+            # converged, out of iterations, or diverged to NaN
+            break
+        X.append(x)
+        F.append(f)
+        X = X[-depth - 1:]
+        F = F[-depth - 1:]
+        if len(F) > 1:
+            dX = np.diff(X, axis=0).T
+            dF = np.diff(F, axis=0).T
+            weights = np.linalg.lstsq(dF, f, rcond=None)[0]
+            x = Gx - np.dot(dX + dF, weights)
+        else:
+            x = Gx
+    return x, Gx, residual, k
+
+
+class WakeHistoryWriter(object):
+    """
+    Records snapshots of the wake (Gamma, z, r, vz, vr at a time t) to the
+    subdirectory subdir of path, as .npy chunks of chunkSize snapshots
+    written through a memory map. Only the current chunk is mapped, so memory
+    use does not grow with the length of the run. A new writer replaces the
+    record in subdir; nothing else in path is touched. Read back with
+    WakeHistory(path).
+    """
+
+    fields = ('Gamma', 'z', 'r', 'vz', 'vr')
+    subdir = 'wakeHistory'
+
+    def __init__(self, path, shape, chunkSize=64):
+        path = os.path.join(path, self.subdir)
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        for name in _historyChunks(path, 'wake') + _historyChunks(path, 'time'):
+            os.remove(name)
+        self.path = path
+        self.shape = tuple(shape)
+        self.chunkSize = chunkSize
+        self.count = 0
+        self.wake = None
+        self.time = None
+
+    def append(self, t, Gamma, z, r, vz, vr):
+        k = self.count % self.chunkSize
+        if k == 0:
+            chunk = self.count // self.chunkSize
+            self.wake = open_memmap(_historyName(self.path, 'wake', chunk), 'w+',
+                                    float, (self.chunkSize, 5) + self.shape)
+            self.time = open_memmap(_historyName(self.path, 'time', chunk), 'w+',
+                                    float, (self.chunkSize,))
+        for i, value in enumerate((Gamma, z, r, vz, vr)):
+            self.wake[k, i] = value
+        self.time[k] = t
+        self.count += 1
+
+    def close(self):
+        """ flush the last chunk, trimmed to the snapshots written """
+        if self.wake is None:
+            return
+        n = (self.count - 1) % self.chunkSize + 1
+        chunk = (self.count - 1) // self.chunkSize
+        if n < self.chunkSize:
+            wake = np.array(self.wake[:n])
+            time = np.array(self.time[:n])
+            self.wake = self.time = None
+            np.save(_historyName(self.path, 'wake', chunk), wake)
+            np.save(_historyName(self.path, 'time', chunk), time)
+        else:
+            self.wake.flush()
+            self.time.flush()
+        self.wake = self.time = None
+
+
+class WakeHistory(object):
+    """
+    Lazy reader of a wake history written by WakeHistoryWriter.
+    history[k] is the snapshot k, a dict of 't' and the fields of
+    WakeHistoryWriter, read through a memory map of its chunk; iterating
+    maps one chunk at a time.
+    """
+
+    def __init__(self, path):
+        path = os.path.join(path, WakeHistoryWriter.subdir)
+        self.path = path
+        self.chunks = _historyChunks(path, 'wake')
+        self.time = np.concatenate([np.load(name) for name in
+                                    _historyChunks(path, 'time')] or [np.zeros(0)])
+        self.chunkSize = np.load(self.chunks[0], mmap_mode='r').shape[0] \
+            if self.chunks else 1
+
+    def __len__(self):
+        return self.time.size
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError('wake history index out of range')
+        wake = np.load(self.chunks[k // self.chunkSize], mmap_mode='r')
+        return self._snapshot(k, wake[k % self.chunkSize])
+
+    def __iter__(self):
+        k = 0
+        for name in self.chunks:
+            for snapshot in np.load(name, mmap_mode='r'):
+                yield self._snapshot(k, snapshot)
+                k += 1
+
+    def _snapshot(self, k, snapshot):
+        fields = dict(zip(WakeHistoryWriter.fields, snapshot))
+        fields['t'] = self.time[k]
+        return fields
+
+
+def _historyName(path, kind, chunk):
+    return os.path.join(path, '%s_%05d.npy' % (kind, chunk))
+
+
+def _historyChunks(path, kind):
+    return sorted(os.path.join(path, name) for name in os.listdir(path)
+                  if name.startswith(kind + '_') and name.endswith('.npy'))
+
 
 class vortexRing(Component):
     """
@@ -23,6 +931,47 @@ class vortexRing(Component):
     qh = Array(np.array([0, -0.0179, -0.0427, -0.0727, -0.1049, -0.1331,
                          -0.1445, -0.1247, -0.0789, -0.0181, 0.0480]),
                iotype="in")
+    induction = Enum('quadrature', ('quadrature', 'elliptic', 'adaptive'), iotype="in",
+                     desc="Ring induction model: midpoint quadrature in theta, closed-form elliptic integrals, or Gauss-Legendre with points adapted per ring")
+    evaluator = Enum('direct', ('direct', 'tree'), iotype="in",
+                     desc="Ring-ring summation: direct or Barnes-Hut tree code")
+    openingAngle = Float(0.5, iotype="in",
+                         desc="Tree code accuracy: cell size / distance below which a cell is lumped")
+    treeThreshold = Int(2000, iotype="in",
+                        desc="Number of active rings below which the tree code sums directly")
+    Kfreeze = Int(0, iotype="in",
+                  desc="Disks older than Kfreeze are frozen and replaced by semi-infinite vortex cylinders (0 - off)")
+    integrator = Enum('euler', ('euler', 'rk2', 'rk4', 'ab2'), iotype="in",
+                      desc="Time integration of the ring positions: forward Euler, Heun, Runge-Kutta or Adams-Bashforth")
+    stepTol = Float(0., iotype="in",
+                    desc="Local error tolerance of the ring positions for adaptive steps, with Ntt initial steps per blade passage (0 - Ntt fixed steps; not for euler)")
+    GammaInit = Array(np.zeros(0), iotype="in",
+                      desc="Initial wake circulation, e.g. Gamma of a previous run (empty - start from the rotor)")
+    zInit = Array(np.zeros(0), iotype="in", desc="Initial wake ring heights, e.g. z of a previous run")
+    rInit = Array(np.zeros(0), iotype="in", desc="Initial wake ring radii, e.g. r of a previous run")
+    viTol = Float(0., iotype="in",
+                  desc="With an initial wake, stop once the blade induced velocity changes less than viTol over a revolution (0 - march Nw revolutions)")
+    solver = Enum('march', ('march', 'periodic'), iotype="in",
+                  desc="Wake solution: march Nw revolutions from the initial wake, or solve for the periodic wake by Anderson acceleration")
+    periodicTol = Float(1e-3, iotype="in",
+                        desc="Periodic solver tolerance on the change of ring positions over a revolution")
+    maxIter = Int(50, iotype="in", desc="Maximum number of revolutions of the periodic solver")
+    andersonDepth = Int(5, iotype="in", desc="Number of previous iterates mixed by the periodic solver")
+    NwTol = Float(0., iotype="in",
+                  desc="Stop adding disks once the blade induced velocity changes by less than NwTol (relative) over a revolution (0 - always Nw disks)")
+    threads = Int(1, iotype="in", desc="Number of threads evaluating the wake velocity")
+    precision = Enum('double', ('double', 'single'), iotype="in",
+                     desc="Precision of the ring quadrature temporaries (sums are always double)")
+    kernelBytes = Int(2 ** 22, iotype="in",
+                      desc="Approximate bytes of temporaries per tile of the ring kernels")
+    cover = Int(0, iotype="in", desc="0 - no cover over root rotor blades, 1 - cover")
+    ycmax = Float(1.4656, iotype="in", desc="Radius of the cover over the blade root")
+    historyPath = Str('', iotype="in",
+                      desc="Directory to record the wake at every (sub)step of the march to, in its subdirectory WakeHistoryWriter.subdir, read with WakeHistory (empty - no record)")
+    historyChunk = Int(64, iotype="in", desc="Number of wake snapshots per file of the history record")
+    mergeDistance = Float(0., iotype="in",
+                          desc="Rings further than mergeDistance below the rotor are merged with close neighbours of the same sign (0 - no merging; march solver)")
+    mergeTol = Float(2., iotype="in", desc="Distance between rings, in core radii, below which they are merged")
 
     # Outputs:
     dtheta = Float(1, iotype="out")
@@ -35,9 +984,44 @@ class vortexRing(Component):
     vr = Array(np.zeros(10), iotype="out")
     thetaArray = Array(np.zeros(10), iotype="out")
     yE = Array(np.zeros(10), iotype="out")
+    rCyl = Array(np.zeros(0), iotype="out", desc="Radius of the far-wake cylinders")
+    zCyl = Array(np.zeros(0), iotype="out", desc="Start height of the far-wake cylinders")
+    dzCyl = Array(np.zeros(0), iotype="out", desc="Disk spacing (direction) of the far-wake cylinders")
+    GammaCyl = Array(np.zeros(0), iotype="out", desc="Ring circulation of the far-wake cylinders")
+    Nvel = Int(0, iotype="out", desc="Number of wake velocity evaluations")
+    Nrev = Int(0, iotype="out", desc="Number of revolutions marched (or periodic solver iterations)")
+    residual = Float(0., iotype="out",
+                     desc="Periodic solver residual: largest change of ring position over a revolution")
+    converged = Int(1, iotype="out",
+                    desc="1 - converged (the periodic solver met periodicTol; the march solver always gives 1), 0 - the periodic solver stopped at maxIter or diverged")
+    NwUsed = Int(0, iotype="out", desc="Number of disks in the wake; the outputs have NwUsed + 1 rows")
+    rCover = Array(np.zeros(0), iotype="out", desc="Radius of the cover rings")
+    zCover = Array(np.zeros(0), iotype="out", desc="Height of the cover rings")
+    GammaCover = Array(np.zeros(0), iotype="out", desc="Circulation of the cover rings")
+    Nmerged = Int(0, iotype="out", desc="Number of rings merged away")
 
 
     def execute(self):
+        self.converged = 1
+        pool = ThreadPool(self.threads) if self.threads > 1 else None
+        sink = None
+        if self.historyPath:
+            sink = WakeHistoryWriter(self.historyPath,
+                                     (self.Nw + 1, max(self.yN.shape)),
+                                     self.historyChunk)
+        try:
+            self.solveWake(pool, sink)
+        finally:
+            if pool:
+                pool.close()
+            if sink:
+                sink.close()
+
+    def solveWake(self, pool, sink=None):
+        """
+        wake solution, with the wake velocity evaluated on pool and the wake
+        at every (sub)step recorded to sink if given
+        """
         self.Ns=max(self.yN.shape) - 1
         dy=np.zeros(self.Ns)
         self.yE=np.zeros(self.Ns)
@@ -48,9 +1032,14 @@ class vortexRing(Component):
         self.cr=0.5 * mean(dy)
         self.dtheta=pi / self.Ntheta
         self.thetaArray=linspace(0 + self.dtheta / 2,pi - self.dtheta / 2,self.Ntheta)
-        self.Gamma=np.zeros((self.Nw + 1,self.Ns + 1))
-        self.z=np.zeros((self.Nw + 1,self.Ns + 1))
-        self.r=np.zeros((self.Nw + 1,self.Ns + 1))
+        # the wake (Gamma, r, z) is a window of Nw + 1 rows, starting at
+        # head, in buffers of 2 Nw + 1 rows: a run sheds at most Nw disks,
+        # and shedding a disk moves head back one row, so nothing is copied
+        rows = self.Nw + 1
+        # (with a flag for rings merged away)
+        buffers = np.zeros((4, rows + self.Nw, self.Ns + 1))
+        head = self.Nw
+        self.Gamma, self.r, self.z, dead = buffers[:, head:head + rows]
         self.vz=np.zeros((self.Nw + 1,self.Ns + 1))
         self.vr=np.zeros((self.Nw + 1,self.Ns + 1))
         vi=np.zeros((self.Ns,1))
@@ -65,54 +1054,207 @@ class vortexRing(Component):
         self.r[0,:]=self.yN
         self.z[0,:]=self.qh[:]
 
+        if self.evaluator == 'tree':
+            kernel = treeRingVelocity
+            options = dict(openingAngle=self.openingAngle,
+                           threshold=self.treeThreshold)
+        else:
+            kernel = ringVelocity
+            options = {}
+        options['precision'] = self.precision
+        options['maxBytes'] = self.kernelBytes
+
+        def wakeVelocity(yp, zp, r, zr, Gamma):
+            if pool:
+                return threadedVelocity(pool, self.threads, kernel, yp, zp, r,
+                                        zr, Gamma, self.thetaArray, self.dtheta,
+                                        self.cr, self.h, induction=self.induction,
+                                        **options)
+            return kernel(yp, zp, r, zr, Gamma, self.thetaArray, self.dtheta,
+                          self.cr, self.h, induction=self.induction, **options)
+
+        def fieldVelocity(yp, zp, r, zr, Gamma):
+            # velocity induced by rings and the far-wake cylinders
+            vr, vz = wakeVelocity(yp, zp, r, zr, Gamma)
+            if self.rCyl.size:
+                vrCyl, vzCyl = cylinderVelocity(yp, zp, self.rCyl, self.zCyl,
+                                                self.dzCyl, self.GammaCyl,
+                                                self.cr, self.h)
+                vr += vrCyl
+                vz += vzCyl
+            return vr, vz
+
+        # cover rings over the blade root, at the nodes inside ycmax, with
+        # the covered elements as collocation points
+        zE = (self.qh[:self.Ns] + self.qh[1:]) / 2
+        sCover = min(np.sum(self.yN < self.ycmax), self.Ns) if self.cover else 0
+        self.rCover = self.yN[1:sCover + 1].copy()
+        self.zCover = self.qh[1:sCover + 1].copy()
+        self.GammaCover = np.zeros(sCover)
+        if sCover:
+            coverLU = self.coverFactor(self.yE[:sCover], zE[:sCover])
+
+        def coverVelocity(yp, zp, ringFrac=1.0):
+            return ringVelocity(yp, zp, self.rCover, self.zCover, self.GammaCover,
+                                self.thetaArray, self.dtheta, self.cr, self.h,
+                                ringFrac, induction=self.induction,
+                                precision=self.precision,
+                                maxBytes=self.kernelBytes)
+
+        def solveCover(n):
+            # cover circulation cancelling the axial velocity induced by the
+            # first n disks at the collocation points
+            vz = fieldVelocity(self.yE[:sCover], zE[:sCover], self.r[:n, 1:],
+                               self.z[:n, 1:], self.Gamma[:n, 1:])[1]
+            self.GammaCover = lu_solve(coverLU, - vz)
+
+        def velocity(r, z):
+            # velocity on every ring of the free disks, induced by the rings
+            # of those disks (the root ring cancels itself out)
+            n = r.shape[0]
+            sources = (r[:, 1:], z[:, 1:], self.Gamma[:n, 1:])
+            if self.mergeDistance <= 0 and not sCover:
+                return fieldVelocity(r, z, *sources)
+
+            # rings merged away neither induce velocity nor move
+            moving = dead[:n] == 0
+            sources = tuple(x[moving[:, 1:]] for x in sources)
+            yp = r[moving]
+            zp = z[moving]
+            if sCover:
+                # the collocation points are evaluated along with the rings
+                yp = np.concatenate((yp, self.yE[:sCover]))
+                zp = np.concatenate((zp, zE[:sCover]))
+            vr, vz = fieldVelocity(yp, zp, *sources)
+            k = moving.sum()
+            v = np.zeros((2,) + r.shape)
+            v[0][moving] = vr[:k]
+            v[1][moving] = vz[:k]
+            if sCover:
+                self.GammaCover = lu_solve(coverLU, - vz[k:])
+                vrCover, vzCover = coverVelocity(yp[:k], zp[:k])
+                v[0][moving] += vrCover
+                v[1][moving] += vzCover
+            return v[0], v[1]
+
+        def bladeVelocity(n):
+            # induced velocity at the blade of the first n disks, as in
+            # inducedVelocity, with the cover solved for those disks
+            if self.rCyl.size:
+                n = min(n, self.Kfreeze)
+            ringFrac = np.ones((n, 1))
+            ringFrac[0] = 0.675
+            vz = fieldVelocity(self.yE, zE, self.r[:n, 1:], self.z[:n, 1:],
+                               self.Gamma[:n, 1:] * ringFrac)[1]
+            if sCover:
+                solveCover(n)
+                vz += coverVelocity(self.yE, zE, 0.675)[1]
+            return - vz
+
+        def closeWake(dz):
+            # replace the disks from Kfreeze on by cylinders of pitch dz
+            K = self.Kfreeze
+            dz = np.where(dz < 0, -1., 1.) * np.maximum(np.abs(dz), self.cr)
+            self.rCyl = self.r[K, 1:].copy()
+            self.zCyl = self.z[K, 1:] - dz / 2
+            self.dzCyl = dz
+            self.GammaCyl = self.Gamma[K, 1:].copy()
+
+        self.rCyl = np.zeros(0)
+        self.zCyl = np.zeros(0)
+        self.dzCyl = np.zeros(0)
+        self.GammaCyl = np.zeros(0)
+        self.Nvel = 0
+        self.Nmerged = 0
+        history = None
+
+        warm = self.zInit.size > 0
+        if warm:
+            # continue from the given wake, with a nascent disk of the
+            # current design
+            shape = (self.Nw + 1, self.Ns + 1)
+            if not self.GammaInit.shape == self.zInit.shape == self.rInit.shape == shape:
+                raise ValueError('initial wake must be (Nw + 1) x (Ns + 1) for GammaInit, zInit and rInit')
+            self.Gamma[1:] = self.GammaInit[1:]
+            self.z[1:] = self.zInit[1:]
+            self.r[1:] = self.rInit[1:]
+        if warm:
+            K = self.Kfreeze
+            if 0 < K <= self.Nw:
+                closeWake(self.z[K, 1:] - self.z[K - 1, 1:])
+            viLast = bladeVelocity(self.Nw)
+
+        if self.solver == 'periodic':
+            if sCover:
+                raise ValueError('the periodic solver does not support the cover')
+            self.solvePeriodic(velocity, closeWake, warm)
+            self.NwUsed = self.Nw
+            return
+
         for t in range(1,(self.Nw+1)):
-            for tt in range(1,(self.Ntt+1)):
-                self.vz=np.zeros((self.Nw + 1,self.Ns + 1))
-                self.vr=np.zeros((self.Nw + 1,self.Ns + 1))
-                for i in range(1,(t+1)):
-                    for s in range(1,(self.Ns + 1+1)):
-                        for ii in range(1,(t+1)):
-                            for ss in range(2,(self.Ns + 1+1)):
-                                zr=self.z[(ii-1),(ss-1)]
-                                r=self.r[(ii-1),(ss-1)]
-                                zp=self.z[(i-1),(s-1)]
-                                yp=self.r[(i-1),(s-1)]
-                                M=self.Gamma[(ii-1),(ss-1)] * r * self.dtheta / (2 * pi)
-                                X2=(- r * sin(self.thetaArray)) ** 2
-                                Y2=(yp - r * cos(self.thetaArray)) ** 2
-                                Z2=(zp - zr) ** 2
-                                Normal=sqrt(X2 + Y2 + Z2)
-                                for iii in range(1,(max(self.thetaArray.shape)+1)):
-                                    if Normal[(iii-1)] < self.cr:
-                                        Normal[(iii-1)]=self.cr
-                                Norm3=Normal ** 3
-                                self.vr[(i-1),(s-1)]=self.vr[(i-1),(s-1)] + np.sum(- cos(self.thetaArray) * (zp - zr) / Norm3) * M
-                                self.vz[(i-1),(s-1)]=self.vz[(i-1),(s-1)] + np.sum((cos(self.thetaArray) * yp - r) / Norm3) * M
-                                zr=- 2 * self.h - self.z[(ii-1),(ss-1)]
-                                Z2=(zp - zr) ** 2
-                                Normal=sqrt(X2 + Y2 + Z2)
-                                for iii in range(1,(max(self.thetaArray.shape)+1)):
-                                    if Normal[(iii-1)] < self.cr:
-                                        Normal[(iii-1)]=self.cr
-                                Norm3=Normal ** 3
-                                self.vr[(i-1),(s-1)]=self.vr[(i-1),(s-1)] - np.sum(- cos(self.thetaArray) * (zp - zr) / Norm3) * M
-                                self.vz[(i-1),(s-1)]=self.vz[(i-1),(s-1)] - np.sum((cos(self.thetaArray) * yp - r) / Norm3) * M
-
-                if tt == 1:
-                    PiApprox=8 * np.sum(self.dT.dot(vi))
-                realtime=2 * pi / self.Omega / self.b * ((t - 1) * self.Ntt + tt) / self.Ntt
-                altitude=self.vc * realtime
-                dt=2 * pi / self.Omega / self.b / self.Ntt
-
-                for i in range(1,(t+1)):
-                    for s in range(1,(self.Ns + 1+1)):
-                        self.z[(i-1),(s-1)]=self.z[(i-1),(s-1)] + self.vz[(i-1),(s-1)] * dt
-                        self.r[(i-1),(s-1)]=self.r[(i-1),(s-1)] + self.vr[(i-1),(s-1)] * dt
-                        self.Gamma[(i-1),(s-1)]=self.Gamma[(i-1),(s-1)]
-            for i in range(1, t+1)[::-1]:
-                self.Gamma[(i + 1-1),:]=self.Gamma[(i-1),:]
-                self.r[(i + 1-1),:]=self.r[(i-1),:]
-                self.z[(i + 1-1),:]=self.z[(i-1),:]
+            # number of disks in the wake, and of free (unfrozen) ones
+            m = self.Nw if warm else t
+            n = m
+            if self.Kfreeze > 0:
+                n = min(m, self.Kfreeze)
+
+            zOldest = self.z[n - 1].copy()
+            if self.integrator == 'euler':
+                for tt in range(1,(self.Ntt+1)):
+                    self.vr[:n], self.vz[:n] = velocity(self.r[:n], self.z[:n])
+                    self.Nvel += 1
+                    if sink:
+                        time = 2 * pi / self.Omega / self.b * (t - 1 + (tt - 1.) / self.Ntt)
+                        sink.append(time, self.Gamma, self.z, self.r, self.vz,
+                                    self.vr)
+
+                    if tt == 1:
+                        PiApprox=8 * np.sum(self.dT.dot(vi))
+                    realtime=2 * pi / self.Omega / self.b * ((t - 1) * self.Ntt + tt) / self.Ntt
+                    altitude=self.vc * realtime
+                    dt=2 * pi / self.Omega / self.b / self.Ntt
+
+                    self.z[:n] += self.vz[:n] * dt
+                    self.r[:n] += self.vr[:n] * dt
+                    if tt == 1 and sCover:
+                        # the nascent disk takes up the cover circulation
+                        self.Gamma[0, 1:sCover + 1] += self.GammaCover
+            else:
+                if history is not None:
+                    # the disks moved down one row and a new disk was shed
+                    fPrev, dtPrev = history
+                    shed = np.nan * np.ones((2, 1, self.Ns + 1))
+                    history = (np.concatenate((shed, fPrev[:, :n - 1]), axis=1), dtPrev)
+
+                if sCover:
+                    # the nascent disk takes up the cover circulation at the
+                    # start of the revolution
+                    solveCover(n)
+                    self.Gamma[0, 1:sCover + 1] += self.GammaCover
+                T = 2 * pi / self.Omega / self.b
+
+                def record(time, r, z, vr, vz):
+                    # the free disks at the step, with the frozen ones
+                    sink.append(T * (t - 1) + time, self.Gamma,
+                                np.concatenate((z, self.z[n:])),
+                                np.concatenate((r, self.r[n:])),
+                                np.concatenate((vz, self.vz[n:])),
+                                np.concatenate((vr, self.vr[n:])))
+
+                (self.r[:n], self.z[:n], self.vr[:n], self.vz[:n], Nvel,
+                 history) = marchWake(velocity, self.r[:n], self.z[:n], T,
+                                      self.Ntt, self.integrator, self.stepTol,
+                                      history, record if sink else None)
+                self.Nvel += Nvel
+            # shed a disk: every disk moves down one row
+            head -= 1
+            self.Gamma, self.r, self.z, dead = buffers[:, head:head + rows]
+            dead[0] = 0
+
+            if self.Kfreeze > 0 and m >= self.Kfreeze:
+                # the oldest free disk has just been frozen: continue it at
+                # the distance it was convected over the last revolution
+                closeWake(self.z[self.Kfreeze, 1:] - zOldest[1:])
 
             GammaBound = self.dT / (self.rho*(self.Omega*self.yE)*dy)
             self.Gamma[0,0]=- GammaBound[0]
@@ -122,6 +1264,125 @@ class vortexRing(Component):
             self.r[0,:]=self.yN
             self.z[0,:]=self.qh[:]
 
+            if self.mergeDistance > 0:
+                merged = mergeRings(self.Gamma[1:m + 1], self.r[1:m + 1],
+                                    self.z[1:m + 1], - self.mergeDistance,
+                                    self.mergeTol * self.cr)
+                dead[1:m + 1][merged] = 1
+                self.Nmerged += merged.sum()
+
+            self.Nrev = t
+            if warm and self.viTol > 0:
+                viBlade = bladeVelocity(self.Nw)
+                if np.abs(viBlade - viLast).max() < self.viTol:
+                    break
+                viLast = viBlade
+            elif not warm and self.NwTol > 0:
+                # stop adding disks once the blade induced velocity settles
+                viBlade = bladeVelocity(t)
+                if t > 1 and np.abs(viBlade - viLast).max() < self.NwTol * np.abs(viBlade).max():
+                    break
+                viLast = viBlade
+
+        self.NwUsed = self.Nrev if not warm else self.Nw
+        if self.NwUsed < self.Nw:
+            rows = self.NwUsed + 1
+            self.Gamma = self.Gamma[:rows]
+            self.z = self.z[:rows]
+            self.r = self.r[:rows]
+            self.vz = self.vz[:rows]
+            self.vr = self.vr[:rows]
+        if sCover:
+            # the cover of the final wake, as summed by inducedVelocity
+            n = self.NwUsed
+            if self.rCyl.size:
+                n = min(n, self.Kfreeze)
+            solveCover(n)
+
+    def coverFactor(self, yp, zp):
+        """
+        LU factorization of the axial velocity induced at the collocation
+        points (yp, zp) by the cover rings of unit circulation. It only
+        depends on the rotor geometry, so it is kept from one call to the
+        next while that is unchanged.
+        """
+        key = (self.yN.tobytes(), self.qh.tobytes(), self.ycmax, self.h,
+               self.Ntheta, self.induction, self.precision)
+        cache = getattr(self, '_coverCache', None)
+        if cache is None or cache[0] != key:
+            C = ringInfluence(yp, zp, self.rCover, self.zCover, self.thetaArray,
+                              self.dtheta, self.cr, self.h,
+                              induction=self.induction, precision=self.precision,
+                              maxBytes=self.kernelBytes, radial=False)[1]
+            cache = self._coverCache = (key, lu_factor(C))
+        return cache[1]
+
+
+    def solvePeriodic(self, velocity, closeWake, warm):
+        """
+        Periodic hover wake: every disk is shed with the current loading and
+        convected for one blade passage into the next, so the free disks
+        1..n are a fixed point of one revolution of the wake. Starts from
+        the initial wake, or from flat disks descending at the momentum
+        theory induced velocity. If the residual is still above periodicTol
+        after maxIter iterations, converged is set to 0 and a warning is
+        logged; the last iterate is kept.
+        """
+        Nw = self.Nw
+        Ns = self.Ns
+        n = Nw
+        if self.Kfreeze > 0:
+            n = min(Nw, self.Kfreeze)
+        T = 2 * pi / self.Omega / self.b
+        self.Gamma[1:] = self.Gamma[0]
+        if not warm:
+            R = self.yN[-1]
+            vh = sqrt(np.sum(self.dT) / (2 * self.rho * pi * R ** 2))
+            k = np.arange(1, Nw + 1)[:, np.newaxis]
+            self.r[1:] = self.yN
+            self.z[1:] = np.maximum(self.qh - k * vh * T, - self.h + self.cr)
+
+        def revolution(x):
+            self.r[1:n + 1], self.z[1:n + 1] = x.reshape(2, n, Ns + 1)
+            if n < Nw:
+                closeWake(self.z[n, 1:] - self.z[n - 1, 1:])
+            r = self.r[:n].copy()
+            z = self.z[:n].copy()
+            if self.integrator == 'euler':
+                dt = T / self.Ntt
+                for tt in range(self.Ntt):
+                    vr, vz = velocity(r, z)
+                    r += vr * dt
+                    z += vz * dt
+                self.Nvel += self.Ntt
+            else:
+                r, z, vr, vz, Nvel, history = marchWake(velocity, r, z, T,
+                                                        self.Ntt, self.integrator,
+                                                        self.stepTol)
+                self.Nvel += Nvel
+            self.vr[:n] = vr
+            self.vz[:n] = vz
+            return np.concatenate((r.ravel(), z.ravel()))
+
+        x = np.concatenate((self.r[1:n + 1].ravel(), self.z[1:n + 1].ravel()))
+        x, Gx, self.residual, self.Nrev = andersonSolve(revolution, x,
+                                                        self.periodicTol,
+                                                        self.maxIter,
+                                                        self.andersonDepth)
+        self.r[1:n + 1], self.z[1:n + 1] = Gx.reshape(2, n, Ns + 1)
+        self.converged = int(self.residual < self.periodicTol)
+        if not self.converged:
+            _logger.warning('periodic wake not converged after %d iterations: '
+                            'residual %g m, periodicTol %g m', self.Nrev,
+                            self.residual, self.periodicTol)
+
+        # frozen disks continue the last free one at its pitch
+        if n < Nw:
+            closeWake(self.z[n, 1:] - self.z[n - 1, 1:])
+            k = np.arange(1, Nw - n + 1)[:, np.newaxis]
+            self.r[n + 1:] = self.r[n]
+            self.z[n + 1:] = self.z[n] + k * (self.z[n] - self.z[n - 1])
+
 
 class inducedVelocity(Component):
     """
@@ -141,45 +1402,155 @@ class inducedVelocity(Component):
     Ns = Int(0, iotype="in")
     Nw = Int(8, iotype="in")
     dtheta = Float(1, iotype="in")
+    induction = Enum('quadrature', ('quadrature', 'elliptic', 'adaptive'), iotype="in",
+                     desc="Ring induction model: midpoint quadrature in theta, closed-form elliptic integrals, or Gauss-Legendre with points adapted per ring")
+    evaluator = Enum('direct', ('direct', 'tree'), iotype="in",
+                     desc="Ring-ring summation: direct or Barnes-Hut tree code")
+    openingAngle = Float(0.5, iotype="in",
+                         desc="Tree code accuracy: cell size / distance below which a cell is lumped")
+    treeThreshold = Int(2000, iotype="in",
+                        desc="Number of active rings below which the tree code sums directly")
+    Kfreeze = Int(0, iotype="in",
+                  desc="Number of free disks when the far wake is closed by cylinders")
+    rCyl = Array(np.zeros(0), iotype="in", desc="Radius of the far-wake cylinders")
+    zCyl = Array(np.zeros(0), iotype="in", desc="Start height of the far-wake cylinders")
+    dzCyl = Array(np.zeros(0), iotype="in", desc="Disk spacing (direction) of the far-wake cylinders")
+    GammaCyl = Array(np.zeros(0), iotype="in", desc="Ring circulation of the far-wake cylinders")
+    NwTol = Float(0., iotype="in",
+                  desc="Stop adding disks once the next one changes vi by less than NwTol (relative) (0 - all Nw disks)")
+    threads = Int(1, iotype="in", desc="Number of threads evaluating the wake velocity")
+    precision = Enum('double', ('double', 'single'), iotype="in",
+                     desc="Precision of the ring quadrature temporaries (sums are always double)")
+    kernelBytes = Int(2 ** 22, iotype="in",
+                      desc="Approximate bytes of temporaries per tile of the ring kernels")
+    rCover = Array(np.zeros(0), iotype="in", desc="Radius of the cover rings")
+    zCover = Array(np.zeros(0), iotype="in", desc="Height of the cover rings")
+    GammaCover = Array(np.zeros(0), iotype="in", desc="Circulation of the cover rings")
+    buildInfluence = Int(0, iotype="in",
+                         desc="1 - build dviDGamma on every run (direct evaluator), 0 - only once a wake geometry is run a second time, summing a new one directly")
 
     # Outputs:
     vi = Array(np.zeros(10), iotype="out")
+    NwUsed = Int(0, iotype="out", desc="Number of disks summed")
+    dviDGamma = Array(np.zeros(0), iotype="out",
+                      desc="Influence matrix of the disks, Ns x Nw(Ns+1): vi = dviDGamma Gamma[:Nw].ravel() + cylinders + cover (direct evaluator, with buildInfluence or once a wake geometry is run a second time)")
 
 
     def execute(self):
-        for s in range(1,(self.Ns+1)):
-            self.vi[(s-1)]=0
-            for ii in range(1,(self.Nw+1)):
-                for ss in range(2,(self.Ns + 1+1)):
-                    if (ii == 1):
-                        ringFrac=0.675
-                    else:
-                        ringFrac=1
-                    zr = self.z[(ii-1),(ss-1)]
-                    r = self.r[(ii-1),(ss-1)]
-                    zp = (self.qh[(s-1)] + self.qh[(s + 1-1)]) / 2
-                    yp = self.yE[(s-1)]
-                    M = self.Gamma[(ii-1),(ss-1)] * r * self.dtheta / (2 * pi)
-                    X2 = (- r * sin(self.thetaArray)) ** 2
-                    Y2 = (yp - r * cos(self.thetaArray)) ** 2
-                    Z2 = (zp - zr) ** 2
-                    Normal = sqrt(X2 + Y2 + Z2)
-                    for iii in range(1,(max(self.thetaArray.shape)+1)):
-                        if Normal[(iii-1)] < self.cr:
-                            Normal[(iii-1)] = self.cr
-                    Norm3 = Normal ** 3
-                    self.vi[(s-1)] = self.vi[(s-1)] + ringFrac * np.sum((cos(self.thetaArray) * yp - r) / Norm3) * M
-                    zr = - 2 * self.h - self.z[(ii-1),(ss-1)]
-                    Z2 = (zp - zr) ** 2
-                    Normal = sqrt(X2 + Y2 + Z2)
-                    for iii in range(1,(max(self.thetaArray.shape)+1)):
-                        if Normal[(iii-1)] < self.cr:
-                            Normal[(iii-1)] = self.cr
-                    Norm3 = Normal ** 3
-                    self.vi[(s-1)] = self.vi[(s-1)] - ringFrac * np.sum((cos(self.thetaArray) * yp - r) / Norm3) * M
-        self.vi=- self.vi
+        Ns = self.Ns
+        # the wake may have been cut short (vortexRing.NwUsed)
+        Nw = min(self.Nw, self.r.shape[0] - 1)
+        if self.rCyl.size:
+            # frozen disks are represented by the cylinders
+            Nw = min(Nw, self.Kfreeze)
+        zp = (self.qh[:Ns] + self.qh[1:Ns + 1]) / 2
+
+        # the rings of the first disk only represent part of a helix turn
+        ringFrac = np.ones((Nw, 1))
+        ringFrac[0] = 0.675
+
+        if self.evaluator == 'tree':
+            kernel = treeRingVelocity
+            options = dict(openingAngle=self.openingAngle,
+                           threshold=self.treeThreshold)
+        else:
+            kernel = ringVelocity
+            options = {}
+        options['precision'] = self.precision
+        options['maxBytes'] = self.kernelBytes
+
+        pool = ThreadPool(self.threads) if self.threads > 1 else None
 
+        def diskVelocity(rows):
+            if self.dviDGamma.size:
+                # the columns of the disks in the influence matrix
+                cols = slice(rows.start * (Ns + 1), rows.stop * (Ns + 1))
+                return - np.dot(self.dviDGamma[:, cols], Gamma[cols])
+            args = (self.yE[:Ns], zp,
+                    self.r[rows, 1:Ns + 1], self.z[rows, 1:Ns + 1],
+                    self.Gamma[rows, 1:Ns + 1],
+                    self.thetaArray, self.dtheta, self.cr, self.h,
+                    ringFrac[rows])
+            if pool:
+                return threadedVelocity(pool, self.threads, kernel, *args,
+                                        induction=self.induction, **options)[1]
+            return kernel(*args, induction=self.induction, **options)[1]
 
+        try:
+            A = None
+            if self.evaluator == 'direct':
+                A = self.influenceMatrix(Nw, zp, ringFrac, pool)
+            if A is None:
+                self.dviDGamma = np.zeros(0)
+            else:
+                self.dviDGamma = A
+                Gamma = self.Gamma[:Nw, :Ns + 1].ravel()
+            if self.NwTol > 0:
+                # add disks until the next one changes vi by less than NwTol
+                vz = diskVelocity(slice(0, 1))
+                self.NwUsed = 1
+                while self.NwUsed < Nw:
+                    dvz = diskVelocity(slice(self.NwUsed, self.NwUsed + 1))
+                    vz = vz + dvz
+                    self.NwUsed += 1
+                    if np.abs(dvz).max() < self.NwTol * np.abs(vz).max():
+                        break
+            else:
+                vz = diskVelocity(slice(0, Nw))
+                self.NwUsed = Nw
+        finally:
+            if pool:
+                pool.close()
 
+        # the cylinders continue the wake beyond the last free disk
+        if self.rCyl.size and self.NwUsed == Nw:
+            vz += cylinderVelocity(self.yE[:Ns], zp, self.rCyl, self.zCyl,
+                                   self.dzCyl, self.GammaCyl, self.cr, self.h)[1]
+        # the cover rings are weighted like the first disk
+        if self.GammaCover.size:
+            vz += ringVelocity(self.yE[:Ns], zp, self.rCover, self.zCover,
+                               self.GammaCover, self.thetaArray, self.dtheta,
+                               self.cr, self.h, 0.675, induction=self.induction,
+                               precision=self.precision,
+                               maxBytes=self.kernelBytes)[1]
+        self.vi = - vz
 
+    def influenceMatrix(self, Nw, zp, ringFrac, pool):
+        """
+        dvi/dGamma of the rings of the first Nw disks, weighted by ringFrac,
+        at the blade elements. vi is linear in Gamma, so the matrix is kept
+        from one call to the next while the wake geometry is unchanged. It
+        costs about as much as a direct sum, so unless buildInfluence is set
+        it is only built when a geometry comes back: for a new geometry None
+        is returned and vi is summed directly.
+        """
+        Ns = self.Ns
+        yp = self.yE[:Ns]
+        r = self.r[:Nw, 1:Ns + 1]
+        zr = self.z[:Nw, 1:Ns + 1]
+        key = (r.tobytes(), zr.tobytes(), yp.tobytes(), zp.tobytes(),
+               ringFrac.tobytes(), self.thetaArray.tobytes(), self.dtheta,
+               self.cr, self.h, self.induction, self.precision)
+        cache = getattr(self, '_influenceCache', None)
+        if cache is None or cache[0] != key:
+            cache = self._influenceCache = (key, None)
+            if not self.buildInfluence:
+                return None
+        if cache[1] is None:
+            def rows(s):
+                return ringInfluence(yp[s], zp[s], r, zr, self.thetaArray,
+                                     self.dtheta, self.cr, self.h,
+                                     induction=self.induction,
+                                     precision=self.precision,
+                                     maxBytes=self.kernelBytes,
+                                     radial=False)[1]
 
+            if pool:
+                blocks = np.array_split(np.arange(Ns), self.threads)
+                Az = np.concatenate(pool.map(rows, blocks))
+            else:
+                Az = rows(slice(None))
+            A = np.zeros((Ns, Nw, Ns + 1))
+            A[:, :, 1:] = - Az.reshape(Ns, Nw, Ns) * ringFrac
+            cache = self._influenceCache = (key, A.reshape(Ns, -1))
+        return cache[1]